@@ -6,6 +6,7 @@ Designed for Google Cloud Run deployment
 
 import os
 import json
+import time
 import tempfile
 import shutil
 import logging
@@ -16,9 +17,12 @@ import asyncio
 from concurrent.futures import ProcessPoolExecutor
 
 from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, ORJSONResponse
+from starlette.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel, Field
 import uvicorn
+import aiofiles
+import redis.asyncio as aioredis
 
 # Import the existing split_audio module
 from split_audio import split_audio, get_audio_info, get_optimal_output_format, get_format_bitrate
@@ -30,11 +34,58 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Audio Splitter API",
     description="Split audio files into chunks for OpenAI Whisper transcription",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson serializes the float-heavy chunk listings several times faster than json
+    default_response_class=ORJSONResponse
 )
 
-# Global process pool for CPU-intensive operations
-executor = ProcessPoolExecutor(max_workers=2)
+class SelectiveGZipMiddleware:
+    """
+    GZip responses outside the excluded path prefixes. Chunk listings repeat URL
+    prefixes and field names, so they shrink several-fold. Chunk downloads are
+    already-compressed audio, so they are passed through untouched.
+    """
+    def __init__(self, app, minimum_size: int = 1000, exclude_prefixes: tuple = ()):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
+        self.exclude_prefixes = exclude_prefixes
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and not scope["path"].startswith(self.exclude_prefixes):
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1000, exclude_prefixes=("/download/",))
+
+# Uploads are copied to disk in pieces of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Global process pool for CPU-intensive operations. Each worker runs one split_audio
+# call and its ffmpeg encoder uses its own threads, so leave a core free and cap the
+# pool to avoid oversubscribing larger instances. Override with AUDIO_SPLIT_WORKERS.
+AUDIO_SPLIT_WORKERS = int(os.environ.get(
+    "AUDIO_SPLIT_WORKERS", max(1, min((os.cpu_count() or 2) - 1, 8))
+))
+executor = ProcessPoolExecutor(max_workers=AUDIO_SPLIT_WORKERS)
+
+# Caps concurrent split requests per instance so a burst of large uploads can't
+# exhaust memory; Cloud Run scales out instances for traffic beyond this
+MAX_INFLIGHT_SPLITS = int(os.environ.get("MAX_INFLIGHT_SPLITS", "4"))
+SPLIT_SLOTS = asyncio.Semaphore(MAX_INFLIGHT_SPLITS)
+
+# Content types for chunk downloads, by file extension
+CHUNK_MEDIA_TYPES = {
+    "mp3": "audio/mpeg",
+    "m4a": "audio/mp4",
+    "flac": "audio/flac",
+    "wav": "audio/wav",
+    "ogg": "audio/ogg",
+}
+
+def warm_worker() -> int:
+    """No-op run in each pool worker at startup so the first request doesn't pay for process start-up"""
+    return os.getpid()
 
 class SplitRequest(BaseModel):
     """Request model for audio splitting parameters"""
@@ -62,9 +113,50 @@ class SplitResponse(BaseModel):
     chunks: List[ChunkInfo]
     processing_time_seconds: float
 
-# In-memory job storage (use Redis/Firestore in production)
+# Job metadata lives in Redis with a TTL when REDIS_URL is set, so any instance can
+# look a job up and Redis expiry replaces the delayed cleanup task. Without Redis
+# (local development) jobs are kept in memory.
+REDIS_URL = os.environ.get("REDIS_URL")
+JOB_TTL_SECONDS = int(os.environ.get("JOB_TTL_SECONDS", "3600"))
+JOB_ROOT = os.path.join(tempfile.gettempdir(), "audio_split_jobs")
+
+redis_client = None
+expiry_listener = None
 jobs = {}
 
+def generate_job_id(created_at: datetime, filename: str) -> str:
+    """Timestamped job ID with a random part, unique even for same-named uploads within a second"""
+    return f"{created_at.strftime('%Y%m%d%H%M%S')}_{os.urandom(3).hex()}_{filename}"
+
+def job_dir(job_id: str) -> str:
+    """Working directory of a job, derivable from the job ID alone"""
+    return os.path.join(JOB_ROOT, job_id.replace(os.sep, "_"))
+
+async def save_job(job_id: str, job: dict):
+    """Store job metadata"""
+    if redis_client:
+        await redis_client.set(f"job:{job_id}", json.dumps(job), ex=JOB_TTL_SECONDS)
+    else:
+        jobs[job_id] = job
+
+async def load_job(job_id: str) -> Optional[dict]:
+    """Fetch job metadata, or None if the job is unknown or expired"""
+    if redis_client:
+        data = await redis_client.get(f"job:{job_id}")
+        return json.loads(data) if data else None
+    return jobs.get(job_id)
+
+async def listen_for_expired_jobs():
+    """Remove a job's files when Redis expires its key (needs notify-keyspace-events Ex)"""
+    pubsub = redis_client.pubsub()
+    await pubsub.psubscribe("__keyevent@*__:expired")
+    async for message in pubsub.listen():
+        if message["type"] != "pmessage" or not message["data"].startswith("job:"):
+            continue
+        job_id = message["data"][len("job:"):]
+        shutil.rmtree(job_dir(job_id), ignore_errors=True)
+        logger.info(f"Cleaned up expired job: {job_id}")
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -88,145 +180,158 @@ async def split_audio_endpoint(
     - **quality**: Output quality (low, medium, high)
     - **return_urls**: Return download URLs vs inline data
     """
-    start_time = datetime.now()
-    job_id = f"{start_time.strftime('%Y%m%d%H%M%S')}_{file.filename}"
+    start_time = time.monotonic()
+    created_at = datetime.now()
+    job_id = generate_job_id(created_at, file.filename)
     
     # Validate file
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
     
-    # Create temporary directory for this job
-    temp_dir = tempfile.mkdtemp(prefix=f"audio_split_{job_id}_")
-    input_path = os.path.join(temp_dir, file.filename)
-    output_dir = os.path.join(temp_dir, "chunks")
-    os.makedirs(output_dir, exist_ok=True)
-    
-    try:
-        # Save uploaded file
-        with open(input_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        
-        logger.info(f"Processing file: {file.filename} (job_id: {job_id})")
-        
-        # Analyze audio file
-        duration, bitrate, codec_name = get_audio_info(input_path)
-        
-        # Determine output format
-        if output_format == "auto":
-            output_format = get_optimal_output_format(input_path, detected_codec=codec_name)
-            # Avoid OGG for better OpenAI compatibility
-            if output_format == "ogg":
-                output_format = "m4a"
-        
-        # Calculate chunk duration
-        format_bitrate = get_format_bitrate(output_format, quality, bitrate)
-        max_size_bits = max_size_mb * 8 * 1024 * 1024
-        chunk_duration = (max_size_bits / format_bitrate) * 0.9  # 10% safety margin
-        num_chunks = int(duration / chunk_duration) + (1 if duration % chunk_duration > 0 else 0)
-        
-        # Split audio (run in process pool to avoid blocking)
-        loop = asyncio.get_event_loop()
-        created_files = await loop.run_in_executor(
-            executor,
-            split_audio,
-            input_path,
-            chunk_duration,
-            output_dir,
-            output_format,
-            quality,
-            False,  # verbose
-            None,   # logger
-            False   # stream_mode
-        )
+    async with SPLIT_SLOTS:
+        # Create working directory for this job
+        # The job ID is unique, so the directory is never shared with another job
+        temp_dir = job_dir(job_id)
+        os.makedirs(temp_dir)
+        input_path = os.path.join(temp_dir, file.filename)
+        output_dir = os.path.join(temp_dir, "chunks")
+        os.makedirs(output_dir, exist_ok=True)
         
-        # Prepare response
-        chunks = []
-        for i, chunk_path in enumerate(created_files):
-            chunk_stat = os.stat(chunk_path)
-            chunk_info = ChunkInfo(
-                chunk_number=i + 1,
-                filename=os.path.basename(chunk_path),
-                size_mb=chunk_stat.st_size / (1024 * 1024),
-                duration_seconds=min(chunk_duration, duration - (i * chunk_duration))
+        try:
+            # Stream uploaded file to disk in 1MB pieces so memory stays flat
+            async with aiofiles.open(input_path, "wb") as f:
+                while True:
+                    chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    await f.write(chunk)
+            
+            logger.info(f"Processing file: {file.filename} (job_id: {job_id})")
+            
+            # Analyze audio file
+            duration, bitrate, codec_name = get_audio_info(input_path)
+            
+            # Determine output format
+            if output_format == "auto":
+                output_format = get_optimal_output_format(input_path, detected_codec=codec_name)
+                # Avoid OGG for better OpenAI compatibility
+                if output_format == "ogg":
+                    output_format = "m4a"
+            
+            # Calculate chunk duration
+            format_bitrate = get_format_bitrate(output_format, quality, bitrate)
+            max_size_bits = max_size_mb * 8 * 1024 * 1024
+            chunk_duration = (max_size_bits / format_bitrate) * 0.9  # 10% safety margin
+            num_chunks = int(duration / chunk_duration) + (1 if duration % chunk_duration > 0 else 0)
+            
+            # Split audio (run in process pool to avoid blocking)
+            loop = asyncio.get_event_loop()
+            created_files = await loop.run_in_executor(
+                executor,
+                split_audio,
+                input_path,
+                chunk_duration,
+                output_dir,
+                output_format,
+                quality,
+                False,  # verbose
+                None,   # logger
+                False   # stream_mode
             )
             
-            if return_urls:
-                # In production, upload to GCS and return signed URLs
-                # For now, store path for download endpoint
-                chunk_info.download_url = f"/download/{job_id}/{chunk_info.filename}"
+            # Prepare response
+            chunks = []
+            for i, chunk_path in enumerate(created_files):
+                chunk_stat = os.stat(chunk_path)
+                chunk_info = ChunkInfo(
+                    chunk_number=i + 1,
+                    filename=os.path.basename(chunk_path),
+                    size_mb=chunk_stat.st_size / (1024 * 1024),
+                    duration_seconds=min(chunk_duration, duration - (i * chunk_duration))
+                )
+                
+                if return_urls:
+                    # In production, upload to GCS and return signed URLs
+                    # For now, store path for download endpoint
+                    chunk_info.download_url = f"/download/{job_id}/{chunk_info.filename}"
+                
+                chunks.append(chunk_info)
             
-            chunks.append(chunk_info)
-        
-        # Store job info for download endpoint
-        jobs[job_id] = {
-            "temp_dir": temp_dir,
-            "chunks": created_files,
-            "created_at": start_time
-        }
-        
-        # Calculate processing time
-        processing_time = (datetime.now() - start_time).total_seconds()
-        
-        response = SplitResponse(
-            job_id=job_id,
-            status="completed",
-            input_filename=file.filename,
-            total_chunks=len(chunks),
-            total_duration_seconds=duration,
-            output_format=output_format,
-            chunks=chunks,
-            processing_time_seconds=processing_time
-        )
-        
-        # Schedule cleanup after 1 hour (in production, use Cloud Scheduler)
-        background_tasks.add_task(cleanup_job, job_id, delay_seconds=3600)
-        
-        return response
-        
-    except Exception as e:
-        logger.error(f"Error processing {file.filename}: {str(e)}")
-        # Clean up on error
-        if os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir)
-        raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+            # Store job info for download endpoint
+            await save_job(job_id, {
+                "temp_dir": temp_dir,
+                "chunks": created_files,
+                "created_at": created_at.isoformat()
+            })
+            
+            # Calculate processing time
+            processing_time = time.monotonic() - start_time
+            
+            response = SplitResponse(
+                job_id=job_id,
+                status="completed",
+                input_filename=file.filename,
+                total_chunks=len(chunks),
+                total_duration_seconds=duration,
+                output_format=output_format,
+                chunks=chunks,
+                processing_time_seconds=processing_time
+            )
+            
+            # Without Redis expiry, schedule cleanup after the job TTL
+            if redis_client is None:
+                background_tasks.add_task(cleanup_job, job_id, delay_seconds=JOB_TTL_SECONDS)
+            
+            return response
+            
+        except Exception as e:
+            logger.error(f"Error processing {file.filename}: {str(e)}")
+            # Clean up on error
+            if os.path.exists(temp_dir):
+                shutil.rmtree(temp_dir)
+            raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
 
 @app.get("/download/{job_id}/{filename}")
 async def download_chunk(job_id: str, filename: str):
     """Download a specific chunk file"""
-    if job_id not in jobs:
+    job = await load_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = jobs[job_id]
     file_path = os.path.join(job["temp_dir"], "chunks", filename)
     
-    if not os.path.exists(file_path):
+    # One stat both checks the file exists and is reused for the response headers
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="File not found")
     
+    ext = os.path.splitext(filename)[1][1:].lower()
     return FileResponse(
         path=file_path,
-        media_type="audio/mpeg",
-        filename=filename
+        media_type=CHUNK_MEDIA_TYPES.get(ext, "application/octet-stream"),
+        filename=filename,
+        stat_result=stat
     )
 
 @app.get("/jobs/{job_id}")
 async def get_job_status(job_id: str):
     """Get status of a split job"""
-    if job_id not in jobs:
+    job = await load_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = jobs[job_id]
     return {
         "job_id": job_id,
         "status": "completed",
-        "created_at": job["created_at"].isoformat(),
+        "created_at": job["created_at"],
         "chunk_count": len(job["chunks"])
     }
 
 @app.delete("/jobs/{job_id}")
 async def delete_job(job_id: str):
     """Delete a job and its files"""
-    if job_id not in jobs:
+    if await load_job(job_id) is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
     await cleanup_job(job_id)
@@ -237,26 +342,46 @@ async def cleanup_job(job_id: str, delay_seconds: int = 0):
     if delay_seconds > 0:
         await asyncio.sleep(delay_seconds)
     
-    if job_id in jobs:
-        job = jobs[job_id]
-        if os.path.exists(job["temp_dir"]):
-            shutil.rmtree(job["temp_dir"])
-        del jobs[job_id]
-        logger.info(f"Cleaned up job: {job_id}")
+    shutil.rmtree(job_dir(job_id), ignore_errors=True)
+    if redis_client:
+        await redis_client.delete(f"job:{job_id}")
+    else:
+        jobs.pop(job_id, None)
+    logger.info(f"Cleaned up job: {job_id}")
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize the application"""
+    global redis_client, expiry_listener
+    
+    if REDIS_URL:
+        redis_client = aioredis.from_url(REDIS_URL, decode_responses=True)
+        try:
+            await redis_client.config_set("notify-keyspace-events", "Ex")
+        except Exception as e:
+            # Managed Redis may block CONFIG; enable expired-key events on the instance instead
+            logger.warning(f"Could not enable Redis keyspace notifications: {str(e)}")
+        expiry_listener = asyncio.create_task(listen_for_expired_jobs())
+        logger.info("Using Redis job store")
+    else:
+        logger.warning("REDIS_URL not set - using in-memory job store")
+    
+    # Start every split worker now rather than on the first requests
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(loop.run_in_executor(executor, warm_worker) for _ in range(AUDIO_SPLIT_WORKERS)))
+    
     logger.info("Audio Splitter API started")
-    # In production: Initialize GCS client, Redis connection, etc.
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up on shutdown"""
     logger.info("Shutting down Audio Splitter API")
-    # Clean up all temporary files
-    for job_id in list(jobs.keys()):
-        await cleanup_job(job_id)
+    if redis_client:
+        expiry_listener.cancel()
+        await redis_client.close()
+    # Clean up all temporary files; this instance's chunks can't be served after shutdown
+    jobs.clear()
+    shutil.rmtree(JOB_ROOT, ignore_errors=True)
     executor.shutdown(wait=True)
 
 if __name__ == "__main__":
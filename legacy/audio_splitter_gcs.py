@@ -6,22 +6,37 @@ Optimized for Google Cloud Run deployment
 
 import os
 import json
+import base64
+import time
 import tempfile
+import shutil
 import logging
-from typing import Optional, List
+import mimetypes
+from typing import Optional, List, Tuple
+from contextlib import aclosing, contextmanager
+from collections import OrderedDict
 from datetime import datetime, timedelta
 import asyncio
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse, ORJSONResponse
+from starlette.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel, Field
 import uvicorn
+import aiofiles
+import aiohttp
+import orjson
+import google.auth
+from google.auth.transport.requests import AuthorizedSession
+from requests.adapters import HTTPAdapter
+from google.api_core.exceptions import NotFound
 from google.cloud import storage
 from google.cloud.storage import Blob
+from google.cloud.storage.retry import DEFAULT_RETRY as GCS_RETRY
 
 # Import the existing split_audio module
-from split_audio import split_audio, get_audio_info, get_optimal_output_format, get_format_bitrate
+from split_audio import split_audio, iter_audio_segments, can_stream_copy, get_audio_info, get_optimal_output_format, get_format_bitrate
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -30,21 +45,169 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Audio Splitter API with GCS",
     description="Split audio files into chunks and store in Google Cloud Storage",
-    version="2.0.0"
+    version="2.0.0",
+    # orjson serializes the float-heavy chunk listings several times faster than json
+    default_response_class=ORJSONResponse
 )
 
+class SelectiveGZipMiddleware:
+    """
+    GZip responses outside the excluded path prefixes. Chunk listings repeat URL
+    prefixes and field names, so they shrink several-fold. The NDJSON stream is
+    passed through untouched, since gzip would buffer it and hold back its lines.
+    """
+    def __init__(self, app, minimum_size: int = 1000, exclude_prefixes: tuple = ()):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
+        self.exclude_prefixes = exclude_prefixes
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and not scope["path"].startswith(self.exclude_prefixes):
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1000, exclude_prefixes=("/split-stream",))
+
 # Configuration from environment
 GCS_BUCKET_NAME = os.environ.get("GCS_BUCKET_NAME", "audio-splitter-chunks")
 GCS_UPLOAD_PREFIX = os.environ.get("GCS_UPLOAD_PREFIX", "uploads/")
 GCS_CHUNK_PREFIX = os.environ.get("GCS_CHUNK_PREFIX", "chunks/")
+# Probe results are kept in GCS as <md5 hex>.meta.json sidecars under this prefix
+AUDIO_INFO_PREFIX = f"{GCS_UPLOAD_PREFIX}by-md5/"
 SIGNED_URL_EXPIRY_HOURS = int(os.environ.get("SIGNED_URL_EXPIRY_HOURS", "24"))
+# Threads for blocking GCS uploads; chunk uploads are network-bound so they overlap well
+GCS_UPLOAD_WORKERS = int(os.environ.get("GCS_UPLOAD_WORKERS", "16"))
+# Resumable upload chunk size (multiple of 256KB). Above the default max chunk
+# size so a chunk goes up in one PUT after the session is opened.
+GCS_UPLOAD_CHUNK_BYTES = 32 * 1024 * 1024
+# Source objects at least this large are downloaded as GCS_DOWNLOAD_PARTS concurrent
+# ranged GETs, since one HTTP stream doesn't fill the instance's network bandwidth
+GCS_DOWNLOAD_PARTS = int(os.environ.get("GCS_DOWNLOAD_PARTS", "4"))
+GCS_PARALLEL_DOWNLOAD_MIN_BYTES = 32 * 1024 * 1024
+
+def build_storage_client() -> storage.Client:
+    """
+    Create the GCS client on a session whose connection pool matches the upload
+    thread pool; requests keeps only 10 connections per host by default, so a wider
+    upload fan-out would keep discarding and re-handshaking connections.
+    """
+    credentials, project = google.auth.default(scopes=storage.Client.SCOPE)
+    session = AuthorizedSession(credentials)
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=GCS_UPLOAD_WORKERS))
+    return storage.Client(project=project, credentials=credentials, _http=session)
 
 # Initialize GCS client
-storage_client = storage.Client()
+storage_client = build_storage_client()
 bucket = storage_client.bucket(GCS_BUCKET_NAME)
 
-# Global process pool for CPU-intensive operations
-executor = ProcessPoolExecutor(max_workers=2)
+# Uploads are copied to disk in pieces of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Uploads up to this size are held in memory so the original can go to GCS
+# while it is written to disk, instead of being read back from disk afterwards
+UPLOAD_MEMORY_LIMIT_BYTES = int(os.environ.get("UPLOAD_MEMORY_LIMIT_MB", "50")) * 1024 * 1024
+
+# Global process pool for CPU-intensive operations. Each worker runs one split_audio
+# call and its ffmpeg encoder uses its own threads, so leave a core free and cap the
+# pool to avoid oversubscribing larger instances. Override with AUDIO_SPLIT_WORKERS.
+AUDIO_SPLIT_WORKERS = int(os.environ.get(
+    "AUDIO_SPLIT_WORKERS", max(1, min((os.cpu_count() or 2) - 1, 8))
+))
+executor = ProcessPoolExecutor(max_workers=AUDIO_SPLIT_WORKERS)
+
+# Caps concurrent split requests per instance so a burst of large uploads can't
+# exhaust memory; Cloud Run scales out instances for traffic beyond this
+MAX_INFLIGHT_SPLITS = int(os.environ.get("MAX_INFLIGHT_SPLITS", "4"))
+SPLIT_SLOTS = asyncio.Semaphore(MAX_INFLIGHT_SPLITS)
+
+# All job working directories live under one root, removed as a whole on shutdown
+JOB_ROOT = os.path.join(tempfile.gettempdir(), "audio_split_jobs")
+
+def warm_worker() -> int:
+    """No-op run in each pool worker at startup so the first request doesn't pay for process start-up"""
+    return os.getpid()
+
+# Probe results for GCS objects keyed by content hash, so re-splitting the same
+# object (e.g. with a different chunk size) skips ffprobe. Least recently used
+# entries are evicted past AUDIO_INFO_CACHE_SIZE.
+AUDIO_INFO_CACHE = OrderedDict()
+AUDIO_INFO_CACHE_SIZE = 256
+
+def audio_info_sidecar(content_hash: str) -> Blob:
+    """GCS blob holding the probe result for content with this (base64) hash"""
+    return bucket.blob(f"{AUDIO_INFO_PREFIX}{base64.b64decode(content_hash).hex()}.meta.json")
+
+def read_audio_info_sidecar(content_hash: str):
+    """Load (duration, bitrate, codec_name) from the GCS sidecar, or None if absent (blocking)"""
+    try:
+        meta = json.loads(audio_info_sidecar(content_hash).download_as_text(retry=GCS_RETRY))
+    except NotFound:
+        return None
+    return meta["duration"], meta["bitrate"], meta["codec"]
+
+def write_audio_info_sidecar(content_hash: str, info):
+    """Store a probe result as a GCS sidecar (blocking)"""
+    duration, bitrate, codec_name = info
+    audio_info_sidecar(content_hash).upload_from_string(
+        json.dumps({"duration": duration, "bitrate": bitrate, "codec": codec_name}),
+        content_type="application/json",
+        retry=GCS_RETRY
+    )
+
+async def get_cached_audio_info(input_path: str, content_hash: Optional[str] = None):
+    """
+    get_audio_info, memoized on the file's content hash when one is known: first in
+    memory, then in a GCS sidecar shared by every instance, before running ffprobe
+    """
+    if not content_hash:
+        return get_audio_info(input_path)
+    
+    if content_hash in AUDIO_INFO_CACHE:
+        AUDIO_INFO_CACHE.move_to_end(content_hash)
+        return AUDIO_INFO_CACHE[content_hash]
+    
+    loop = asyncio.get_event_loop()
+    info = None
+    try:
+        info = await loop.run_in_executor(None, read_audio_info_sidecar, content_hash)
+    except Exception as e:
+        # The sidecar is only a cache; fall back to probing the file
+        logger.warning(f"Could not read audio info sidecar: {str(e)}")
+    
+    if info is None:
+        info = get_audio_info(input_path)
+        try:
+            await loop.run_in_executor(None, write_audio_info_sidecar, content_hash, info)
+        except Exception as e:
+            logger.warning(f"Could not write audio info sidecar: {str(e)}")
+    
+    AUDIO_INFO_CACHE[content_hash] = info
+    if len(AUDIO_INFO_CACHE) > AUDIO_INFO_CACHE_SIZE:
+        AUDIO_INFO_CACHE.popitem(last=False)
+    return info
+
+def generate_job_id(filename: str) -> str:
+    """Timestamped job ID with a random part, unique even for same-named uploads within a second"""
+    return f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{os.urandom(3).hex()}_{filename.replace(' ', '_')}"
+
+def job_dir(job_id: str) -> str:
+    """Working directory of a job"""
+    return os.path.join(JOB_ROOT, job_id.replace(os.sep, "_"))
+
+def create_job_dir(job_id: str) -> str:
+    """Create a job's working directory; job IDs are unique, so it is never shared"""
+    temp_dir = job_dir(job_id)
+    os.makedirs(temp_dir)
+    return temp_dir
+
+@contextmanager
+def job_workspace(job_id: str):
+    """Working directory for a job, removed when the job finishes"""
+    temp_dir = create_job_dir(job_id)
+    try:
+        yield temp_dir
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
 
 class SplitRequest(BaseModel):
     """Request model for audio splitting parameters"""
@@ -73,10 +236,19 @@ class SplitResponse(BaseModel):
     chunks: List[ChunkInfo]
     processing_time_seconds: float
 
-def upload_to_gcs(local_path: str, gcs_path: str) -> str:
-    """Upload a file to Google Cloud Storage and return signed URL"""
-    blob = bucket.blob(gcs_path)
-    blob.upload_from_filename(local_path)
+def upload_to_gcs(local_path: str, gcs_path: str) -> Tuple[str, int]:
+    """Upload a file to Google Cloud Storage and return its signed URL and size in bytes"""
+    blob = bucket.blob(gcs_path, chunk_size=GCS_UPLOAD_CHUNK_BYTES)
+    content_type = mimetypes.guess_type(local_path)[0] or "application/octet-stream"
+    with open(local_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        blob.upload_from_file(
+            f,
+            size=size,
+            content_type=content_type,
+            checksum="crc32c",
+            retry=GCS_RETRY
+        )
     
     # Generate signed URL for download
     url = blob.generate_signed_url(
@@ -84,13 +256,58 @@ def upload_to_gcs(local_path: str, gcs_path: str) -> str:
         expiration=timedelta(hours=SIGNED_URL_EXPIRY_HOURS),
         method="GET"
     )
-    return url
+    return url, size
 
-async def upload_to_gcs_async(local_path: str, gcs_path: str) -> str:
+async def upload_to_gcs_async(local_path: str, gcs_path: str) -> Tuple[str, int]:
     """Async wrapper for GCS upload"""
     loop = asyncio.get_event_loop()
     return await loop.run_in_executor(None, upload_to_gcs, local_path, gcs_path)
 
+def download_gcs_range(blob: Blob, local_path: str, start: int, end: int):
+    """Download bytes start..end (inclusive) of a blob into the same offsets of a local file"""
+    with open(local_path, "r+b") as f:
+        f.seek(start)
+        # Checksums cover the whole object, so they can't be checked per range
+        blob.download_to_file(f, start=start, end=end, checksum=None, retry=GCS_RETRY)
+
+async def download_from_gcs_async(blob: Blob, local_path: str):
+    """Download a blob to a local file off the event loop, in parallel ranges for large objects"""
+    loop = asyncio.get_event_loop()
+    size = blob.size or 0
+    
+    if size < GCS_PARALLEL_DOWNLOAD_MIN_BYTES or GCS_DOWNLOAD_PARTS <= 1:
+        await loop.run_in_executor(
+            None, lambda: blob.download_to_filename(local_path, retry=GCS_RETRY)
+        )
+        return
+    
+    # Size the file up front so each range can be written at its own offset
+    with open(local_path, "wb") as f:
+        f.truncate(size)
+    
+    part_size = -(-size // GCS_DOWNLOAD_PARTS)
+    await asyncio.gather(*(
+        loop.run_in_executor(
+            None, download_gcs_range, blob, local_path, start, min(start + part_size, size) - 1
+        )
+        for start in range(0, size, part_size)
+    ))
+
+def upload_bytes_to_gcs(data: bytes, gcs_path: str):
+    """Upload in-memory data to Google Cloud Storage"""
+    blob = bucket.blob(gcs_path)
+    blob.upload_from_string(
+        data,
+        content_type=mimetypes.guess_type(gcs_path)[0] or "application/octet-stream",
+        checksum="crc32c",
+        retry=GCS_RETRY
+    )
+
+async def write_file_async(path: str, data: bytes):
+    """Write data to a local file without blocking the event loop"""
+    async with aiofiles.open(path, "wb") as f:
+        await f.write(data)
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -100,6 +317,110 @@ async def root():
         "bucket": GCS_BUCKET_NAME
     }
 
+async def plan_split(input_path: str, max_size_mb: float, output_format: str, quality: str, content_hash: Optional[str] = None):
+    """
+    Analyze an input file and choose its output format and chunk length.
+    Returns (duration, codec_name, output_format, chunk_duration).
+    """
+    duration, bitrate, codec_name = await get_cached_audio_info(input_path, content_hash)
+    
+    # Determine output format
+    if output_format == "auto":
+        output_format = get_optimal_output_format(input_path, detected_codec=codec_name)
+        # Avoid OGG for better OpenAI compatibility
+        if output_format == "ogg":
+            output_format = "m4a"
+    
+    # Calculate chunk duration
+    format_bitrate = get_format_bitrate(output_format, quality, bitrate)
+    max_size_bits = max_size_mb * 8 * 1024 * 1024
+    chunk_duration = (max_size_bits / format_bitrate) * 0.9  # 10% safety margin
+    
+    return duration, codec_name, output_format, chunk_duration
+
+async def process_local_file(
+    input_path: str,
+    filename: str,
+    job_id: str,
+    start_time: float,
+    background_tasks: BackgroundTasks,
+    max_size_mb: float,
+    output_format: str,
+    quality: str,
+    webhook_url: Optional[str],
+    content_hash: Optional[str] = None
+) -> SplitResponse:
+    """Split an audio file already on local disk and upload its chunks to GCS"""
+    output_dir = os.path.join(os.path.dirname(input_path), "chunks")
+    os.makedirs(output_dir, exist_ok=True)
+    
+    try:
+        duration, _, output_format, chunk_duration = await plan_split(
+            input_path, max_size_mb, output_format, quality, content_hash
+        )
+        
+        # Split audio (run in process pool to avoid blocking)
+        loop = asyncio.get_event_loop()
+        created_files = await loop.run_in_executor(
+            executor,
+            split_audio,
+            input_path,
+            chunk_duration,
+            output_dir,
+            output_format,
+            quality,
+            False,  # verbose
+            None,   # logger
+            False   # stream_mode
+        )
+        
+        # Upload chunks to GCS in parallel
+        async def upload_chunk(i: int, chunk_path: str) -> ChunkInfo:
+            chunk_filename = os.path.basename(chunk_path)
+            gcs_chunk_path = f"{GCS_CHUNK_PREFIX}{job_id}/{chunk_filename}"
+            # The upload already measured the file, so its size needs no extra stat
+            signed_url, size_bytes = await upload_to_gcs_async(chunk_path, gcs_chunk_path)
+            
+            return ChunkInfo(
+                chunk_number=i + 1,
+                filename=chunk_filename,
+                size_mb=size_bytes / (1024 * 1024),
+                duration_seconds=min(chunk_duration, duration - (i * chunk_duration)),
+                gcs_path=f"gs://{GCS_BUCKET_NAME}/{gcs_chunk_path}",
+                download_url=signed_url
+            )
+        
+        # gather keeps chunk order regardless of which upload finishes first
+        chunks = await asyncio.gather(
+            *(upload_chunk(i, chunk_path) for i, chunk_path in enumerate(created_files))
+        )
+        
+        # Calculate processing time
+        processing_time = time.monotonic() - start_time
+        
+        response = SplitResponse(
+            job_id=job_id,
+            status="completed",
+            input_filename=filename,
+            total_chunks=len(chunks),
+            total_duration_seconds=duration,
+            output_format=output_format,
+            chunks=list(chunks),
+            processing_time_seconds=processing_time
+        )
+        
+        # Send webhook notification if provided
+        if webhook_url:
+            background_tasks.add_task(send_webhook, webhook_url, response.dict())
+        
+        logger.info(f"Successfully processed {filename}: {len(chunks)} chunks in {processing_time:.1f}s")
+        
+        return response
+        
+    except Exception as e:
+        logger.error(f"Error processing {filename}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+
 @app.post("/split", response_model=SplitResponse)
 async def split_audio_endpoint(
     background_tasks: BackgroundTasks,
@@ -118,118 +439,178 @@ async def split_audio_endpoint(
     - **quality**: Output quality (low, medium, high)
     - **webhook_url**: Optional webhook for completion notification
     """
-    start_time = datetime.now()
-    job_id = f"{start_time.strftime('%Y%m%d%H%M%S')}_{file.filename.replace(' ', '_')}"
+    start_time = time.monotonic()
+    job_id = generate_job_id(file.filename)
     
     # Validate file
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
     
-    # Create temporary directory for processing
-    with tempfile.TemporaryDirectory(prefix=f"audio_split_{job_id}_") as temp_dir:
-        input_path = os.path.join(temp_dir, file.filename)
-        output_dir = os.path.join(temp_dir, "chunks")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        try:
-            # Save uploaded file
-            with open(input_path, "wb") as f:
-                content = await file.read()
-                f.write(content)
+    async with SPLIT_SLOTS:
+        # Create temporary directory for processing
+        with job_workspace(job_id) as temp_dir:
+            input_path = os.path.join(temp_dir, file.filename)
             
-            logger.info(f"Processing file: {file.filename} (job_id: {job_id})")
-            
-            # Upload original file to GCS
             original_gcs_path = f"{GCS_UPLOAD_PREFIX}{job_id}/{file.filename}"
-            await upload_to_gcs_async(input_path, original_gcs_path)
-            
-            # Analyze audio file
-            duration, bitrate, codec_name = get_audio_info(input_path)
-            
-            # Determine output format
-            if output_format == "auto":
-                output_format = get_optimal_output_format(input_path, detected_codec=codec_name)
-                # Avoid OGG for better OpenAI compatibility
-                if output_format == "ogg":
-                    output_format = "m4a"
             
-            # Calculate chunk duration
-            format_bitrate = get_format_bitrate(output_format, quality, bitrate)
-            max_size_bits = max_size_mb * 8 * 1024 * 1024
-            chunk_duration = (max_size_bits / format_bitrate) * 0.9  # 10% safety margin
-            num_chunks = int(duration / chunk_duration) + (1 if duration % chunk_duration > 0 else 0)
-            
-            # Split audio (run in process pool to avoid blocking)
-            loop = asyncio.get_event_loop()
-            created_files = await loop.run_in_executor(
-                executor,
-                split_audio,
-                input_path,
-                chunk_duration,
-                output_dir,
-                output_format,
-                quality,
-                False,  # verbose
-                None,   # logger
-                False   # stream_mode
-            )
-            
-            # Upload chunks to GCS in parallel
-            chunks = []
-            upload_tasks = []
-            
-            for i, chunk_path in enumerate(created_files):
-                chunk_filename = os.path.basename(chunk_path)
-                gcs_chunk_path = f"{GCS_CHUNK_PREFIX}{job_id}/{chunk_filename}"
+            try:
+                logger.info(f"Processing file: {file.filename} (job_id: {job_id})")
                 
-                # Start upload task
-                upload_task = upload_to_gcs_async(chunk_path, gcs_chunk_path)
-                upload_tasks.append((i, chunk_path, chunk_filename, gcs_chunk_path, upload_task))
-            
-            # Wait for all uploads to complete
-            for i, chunk_path, chunk_filename, gcs_chunk_path, upload_task in upload_tasks:
-                signed_url = await upload_task
-                chunk_stat = os.stat(chunk_path)
+                if file.size is not None and file.size <= UPLOAD_MEMORY_LIMIT_BYTES:
+                    # Small upload: write it to disk for ffmpeg and upload the original
+                    # to GCS at the same time, both from memory
+                    data = await file.read()
+                    loop = asyncio.get_event_loop()
+                    await asyncio.gather(
+                        write_file_async(input_path, data),
+                        loop.run_in_executor(None, upload_bytes_to_gcs, data, original_gcs_path)
+                    )
+                    del data
+                else:
+                    # Stream uploaded file to disk in 1MB pieces so memory stays flat
+                    async with aiofiles.open(input_path, "wb") as f:
+                        while True:
+                            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                            if not chunk:
+                                break
+                            await f.write(chunk)
+                    
+                    # Upload original file to GCS
+                    await upload_to_gcs_async(input_path, original_gcs_path)
                 
-                chunk_info = ChunkInfo(
-                    chunk_number=i + 1,
-                    filename=chunk_filename,
-                    size_mb=chunk_stat.st_size / (1024 * 1024),
-                    duration_seconds=min(chunk_duration, duration - (i * chunk_duration)),
-                    gcs_path=f"gs://{GCS_BUCKET_NAME}/{gcs_chunk_path}",
-                    download_url=signed_url
-                )
-                chunks.append(chunk_info)
+            except Exception as e:
+                logger.error(f"Error processing {file.filename}: {str(e)}")
+                raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
             
-            # Calculate processing time
-            processing_time = (datetime.now() - start_time).total_seconds()
-            
-            response = SplitResponse(
-                job_id=job_id,
-                status="completed",
-                input_filename=file.filename,
-                total_chunks=len(chunks),
-                total_duration_seconds=duration,
-                output_format=output_format,
-                chunks=chunks,
-                processing_time_seconds=processing_time
+            return await process_local_file(
+                input_path, file.filename, job_id, start_time, background_tasks,
+                max_size_mb, output_format, quality, webhook_url
+            )
+
+async def stream_split_results(
+    input_path: str,
+    filename: str,
+    job_id: str,
+    start_time: float,
+    max_size_mb: float,
+    output_format: str,
+    quality: str
+):
+    """
+    Split a staged upload and yield one NDJSON line per chunk as soon as it is in GCS,
+    then a final summary line. Removes the job's working directory when done.
+    """
+    temp_dir = os.path.dirname(input_path)
+    output_dir = os.path.join(temp_dir, "chunks")
+    os.makedirs(output_dir, exist_ok=True)
+    
+    async def upload_chunk(chunk_number: int, chunk_path: str, duration_seconds: float) -> ChunkInfo:
+        chunk_filename = os.path.basename(chunk_path)
+        gcs_chunk_path = f"{GCS_CHUNK_PREFIX}{job_id}/{chunk_filename}"
+        signed_url, size_bytes = await upload_to_gcs_async(chunk_path, gcs_chunk_path)
+        return ChunkInfo(
+            chunk_number=chunk_number,
+            filename=chunk_filename,
+            size_mb=size_bytes / (1024 * 1024),
+            duration_seconds=duration_seconds,
+            gcs_path=f"gs://{GCS_BUCKET_NAME}/{gcs_chunk_path}",
+            download_url=signed_url
+        )
+    
+    async with SPLIT_SLOTS:
+        uploads = []
+        emitted = 0
+        try:
+            duration, codec_name, output_format, chunk_duration = await plan_split(
+                input_path, max_size_mb, output_format, quality
             )
             
-            # Send webhook notification if provided
-            if webhook_url:
-                background_tasks.add_task(send_webhook, webhook_url, response.dict())
+            # Uploads start as soon as ffmpeg closes each chunk; lines go out in chunk order.
+            # aclosing kills ffmpeg and frees its FFMPEG_SEM slot as soon as the stream
+            # stops (e.g. client disconnect), before the working directory is removed
+            segments = iter_audio_segments(
+                input_path, chunk_duration, output_dir, output_format, quality,
+                logger, can_stream_copy(codec_name, output_format)
+            )
+            async with aclosing(segments):
+                async for chunk_path, _, chunk_length in segments:
+                    uploads.append(asyncio.create_task(upload_chunk(len(uploads) + 1, chunk_path, chunk_length)))
+                    while emitted < len(uploads) and uploads[emitted].done():
+                        yield uploads[emitted].result().json() + "\n"
+                        emitted += 1
             
-            logger.info(f"Successfully processed {file.filename}: {len(chunks)} chunks in {processing_time:.1f}s")
+            for upload in uploads[emitted:]:
+                yield (await upload).json() + "\n"
+                emitted += 1
             
-            return response
+            processing_time = time.monotonic() - start_time
+            logger.info(f"Successfully streamed {filename}: {len(uploads)} chunks in {processing_time:.1f}s")
+            yield json.dumps({
+                "job_id": job_id,
+                "status": "completed",
+                "input_filename": filename,
+                "total_chunks": len(uploads),
+                "total_duration_seconds": duration,
+                "output_format": output_format,
+                "processing_time_seconds": processing_time
+            }) + "\n"
             
         except Exception as e:
-            logger.error(f"Error processing {file.filename}: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+            # Headers are already sent, so report the failure in-band
+            logger.error(f"Error processing {filename}: {str(e)}")
+            yield json.dumps({"job_id": job_id, "status": "failed", "error": str(e)}) + "\n"
+        finally:
+            for upload in uploads:
+                upload.cancel()
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
-@app.post("/split-from-gcs")
+@app.post("/split-stream")
+async def split_audio_stream_endpoint(
+    file: UploadFile = File(...),
+    max_size_mb: float = 20,
+    output_format: str = "auto",
+    quality: str = "medium"
+):
+    """
+    Split an audio file and stream chunk metadata back as NDJSON.
+    
+    Each line is a chunk (same fields as /split) sent as soon as that chunk is in GCS,
+    so clients can start on early chunks while later ones are still being split.
+    The last line is a summary with status "completed" or "failed".
+    """
+    start_time = time.monotonic()
+    
+    # Validate file
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No file provided")
+    
+    job_id = generate_job_id(file.filename)
+    
+    # Stage the upload before responding; the stream owns the directory from here on
+    temp_dir = create_job_dir(job_id)
+    input_path = os.path.join(temp_dir, file.filename)
+    try:
+        async with aiofiles.open(input_path, "wb") as f:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                await f.write(chunk)
+    except Exception as e:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        logger.error(f"Error processing {file.filename}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+    
+    logger.info(f"Streaming split of {file.filename} (job_id: {job_id})")
+    return StreamingResponse(
+        stream_split_results(input_path, file.filename, job_id, start_time, max_size_mb, output_format, quality),
+        media_type="application/x-ndjson"
+    )
+
+@app.post("/split-from-gcs", response_model=SplitResponse)
 async def split_from_gcs(
     gcs_path: str,
+    background_tasks: BackgroundTasks,
     max_size_mb: float = 20,
     output_format: str = "auto",
     quality: str = "medium",
@@ -253,42 +634,55 @@ async def split_from_gcs(
         raise HTTPException(status_code=400, detail="Invalid GCS path format")
     
     bucket_name, blob_path = parts
+    filename = os.path.basename(blob_path)
+    start_time = time.monotonic()
+    job_id = generate_job_id(filename)
     
-    # Download file from GCS and process
-    with tempfile.TemporaryDirectory() as temp_dir:
-        local_path = os.path.join(temp_dir, os.path.basename(blob_path))
-        
-        # Download from GCS
-        source_bucket = storage_client.bucket(bucket_name)
-        blob = source_bucket.blob(blob_path)
-        blob.download_to_filename(local_path)
-        
-        # Create fake upload file
-        with open(local_path, "rb") as f:
-            content = f.read()
-        
-        # Process using existing endpoint logic
-        # (In production, refactor to share code properly)
-        upload = UploadFile(filename=os.path.basename(blob_path))
-        upload.file = content
-        
-        return await split_audio_endpoint(
-            BackgroundTasks(),
-            upload,
-            max_size_mb,
-            output_format,
-            quality,
-            webhook_url
+    async with SPLIT_SLOTS:
+        # Download file from GCS and process it where it lands on disk
+        with job_workspace(job_id) as temp_dir:
+            local_path = os.path.join(temp_dir, filename)
+            
+            # Download from GCS without blocking the event loop
+            source_bucket = storage_client.bucket(bucket_name)
+            loop = asyncio.get_event_loop()
+            blob = await loop.run_in_executor(None, source_bucket.get_blob, blob_path)
+            if blob is None:
+                raise HTTPException(status_code=404, detail=f"GCS object not found: {gcs_path}")
+            await download_from_gcs_async(blob, local_path)
+            
+            logger.info(f"Processing file: {gcs_path} (job_id: {job_id})")
+            
+            return await process_local_file(
+                local_path, filename, job_id, start_time, background_tasks,
+                max_size_mb, output_format, quality, webhook_url,
+                # Composite objects have no MD5 and a 32-bit CRC32C is too collision-prone
+                # to identify content, so those skip the probe cache
+                content_hash=blob.md5_hash
+            )
+
+def get_webhook_session() -> aiohttp.ClientSession:
+    """
+    Return the shared webhook session, creating it on first use, so repeated
+    deliveries reuse pooled keep-alive connections instead of a new TLS handshake each
+    """
+    session = getattr(app.state, "webhook_session", None)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=10)
         )
+        app.state.webhook_session = session
+    return session
 
 async def send_webhook(webhook_url: str, data: dict):
     """Send completion notification to webhook"""
-    import aiohttp
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(webhook_url, json=data) as response:
-                if response.status != 200:
-                    logger.error(f"Webhook failed: {response.status}")
+        async with get_webhook_session().post(
+            webhook_url, data=orjson.dumps(data), headers={"Content-Type": "application/json"}
+        ) as response:
+            if response.status != 200:
+                logger.error(f"Webhook failed: {response.status}")
     except Exception as e:
         logger.error(f"Webhook error: {str(e)}")
 
@@ -296,6 +690,16 @@ async def send_webhook(webhook_url: str, data: dict):
 async def startup_event():
     """Initialize the application"""
     logger.info(f"Audio Splitter API started with GCS bucket: {GCS_BUCKET_NAME}")
+    get_webhook_session()
+    
+    # The default executor is too small to overlap a job's chunk uploads
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=GCS_UPLOAD_WORKERS)
+    )
+    
+    # Start every split worker now rather than on the first requests
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(loop.run_in_executor(executor, warm_worker) for _ in range(AUDIO_SPLIT_WORKERS)))
     
     # Verify bucket access
     try:
@@ -304,11 +708,27 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Failed to access GCS bucket: {str(e)}")
         raise
+    
+    # Sign one URL up front so the first request doesn't pay for loading the signer,
+    # and credentials that can't sign are reported at startup rather than mid-job
+    try:
+        bucket.blob("warmup").generate_signed_url(
+            version="v4",
+            expiration=timedelta(seconds=1),
+            method="GET"
+        )
+        logger.info("Signed URL generation verified")
+    except Exception as e:
+        logger.error(f"Cannot generate signed URLs (needs key-based service account credentials): {str(e)}")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up on shutdown"""
     logger.info("Shutting down Audio Splitter API")
+    session = getattr(app.state, "webhook_session", None)
+    if session is not None:
+        await session.close()
+    shutil.rmtree(JOB_ROOT, ignore_errors=True)
     executor.shutdown(wait=True)
 
 if __name__ == "__main__":
@@ -6,27 +6,41 @@ Processes files directly from Google Drive without intermediate downloads
 
 import os
 import io
+import math
+import mimetypes
+import random
+import re
+import shutil
 import tempfile
+import time
 import logging
 from typing import Optional, List, Dict
 from datetime import datetime, timedelta
 import asyncio
-from concurrent.futures import ProcessPoolExecutor
-from functools import partial
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 import uvicorn
+import google.auth
+from google.auth import iam
 from google.cloud import storage
 from google.oauth2 import service_account
+from google.auth.transport.requests import Request as GoogleAuthRequest
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
+from google.api_core.exceptions import NotFound
+from google.cloud.storage.retry import DEFAULT_RETRY as GCS_RETRY
 import aiohttp
+import aiofiles
+import orjson
 
 # Import the existing split_audio module
-from split_audio import split_audio, get_audio_info, get_optimal_output_format, calculate_chunk_duration
+from split_audio import split_audio_parallel, split_audio_segments, split_audio_stream, probe_audio_bytes, get_audio_info, get_optimal_output_format, calculate_chunk_duration, can_stream_copy, QUALITY_BITRATES_KBPS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -55,22 +69,155 @@ if os.path.exists(GOOGLE_SERVICE_ACCOUNT_KEY):
         ]
     )
     storage_client = storage.Client(credentials=credentials)
-    drive_service = build('drive', 'v3', credentials=credentials)
+    # Build from the discovery document bundled with google-api-python-client, so
+    # start-up never waits on (or fails with) a discovery fetch
+    drive_service = build('drive', 'v3', credentials=credentials, cache_discovery=False, static_discovery=True)
     logger.info(f"Using service account credentials from {GOOGLE_SERVICE_ACCOUNT_KEY}")
 else:
     # Fall back to default credentials
+    credentials = None
     storage_client = storage.Client()
     drive_service = None
     logger.warning("Service account key not found - using default credentials")
 
 bucket = storage_client.bucket(GCS_BUCKET_NAME)
 
-# Global process pool
-executor = ProcessPoolExecutor(max_workers=2)
+# Dedicated thread pool for blocking GCS I/O so uploads don't queue behind the default executor
+GCS_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="gcs")
+
+# Drive media download settings
+DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files"
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB socket reads
+DISK_WRITE_BUFFER_SIZE = 4 * 1024 * 1024  # Socket reads are coalesced into 4MB writes (one executor hop each)
+DRIVE_DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_read=60)
+STREAM_PIPE_CHUNK_SIZE = 64 * 1024  # GCS/disk -> OpenAI relay buffer per in-flight chunk
+PARALLEL_DOWNLOAD_THRESHOLD_MB = int(os.environ.get("PARALLEL_DOWNLOAD_THRESHOLD_MB", "75"))
+PARALLEL_DOWNLOAD_RANGE_SIZE = 16 * 1024 * 1024  # 16MB per ranged GET
+PARALLEL_DOWNLOAD_CONCURRENCY = int(os.environ.get("PARALLEL_DOWNLOAD_CONCURRENCY", "8"))
+DRIVE_MAX_RETRIES = int(os.environ.get("DRIVE_MAX_RETRIES", "5"))
+DRIVE_API_TIMEOUT = 60  # seconds per Drive metadata/list call
+DRIVE_HTTP = threading.local()
+
+# Credentials used for V4 URL signing, built once (see get_signing_credentials)
+signing_credentials = credentials
+SIGNING_LOCK = threading.Lock()
+
+# Files that need splitting are piped from Drive straight into ffmpeg when their
+# container can be demuxed without seeking (MP4/M4A keep the index at the end)
+DRIVE_PIPE_SPLIT = os.environ.get("DRIVE_PIPE_SPLIT", "true").lower() == "true"
+PIPE_SPLIT_EXTENSIONS = {'.mp3', '.wav', '.flac', '.ogg', '.opus', '.aac', '.webm'}
+PIPE_PROBE_BYTES = 1024 * 1024  # Head of the file fetched to probe codec and bitrate
+
+# Native Docs/Sheets/etc. have no binary content to download (and no size)
+GOOGLE_APPS_MIME_PREFIX = 'application/vnd.google-apps.'
+
+# In-memory job status store for polling (per instance; lost on restart)
+JOBS: Dict[str, Dict] = {}
+JOB_TASKS = set()
+JOB_RETENTION_SECONDS = int(os.environ.get("JOB_RETENTION_HOURS", "24")) * 3600
+
+# Finished transcripts are cached in GCS by Drive md5Checksum; jobs for the same
+# file that arrive while one is running wait for it instead of redoing the work
+TRANSCRIPT_CACHE_PREFIX = f"{GCS_CHUNK_PREFIX}by-md5/"
+INFLIGHT_JOBS: Dict[str, asyncio.Event] = {}
+
+# Maximum number of folder files started at once (each one holds a temp dir)
+FOLDER_CONCURRENCY = int(os.environ.get("FOLDER_CONCURRENCY", "4"))
+
+# Maximum number of chunk uploads in flight per job
+GCS_UPLOAD_CONCURRENCY = int(os.environ.get("GCS_UPLOAD_CONCURRENCY", "8"))
+# Resumable upload window (multiple of 256KB). 32MB covers a whole Whisper-sized
+# chunk, so most uploads finish in a single PUT instead of one ACK per 8MB
+GCS_UPLOAD_CHUNK_SIZE = int(os.environ.get("GCS_UPLOAD_CHUNK_MB", "32")) * 1024 * 1024
+
+# OpenAI request throttling: bounded concurrency plus a requests-per-minute budget
+OPENAI_TRANSCRIPTIONS_URL = "https://api.openai.com/v1/audio/transcriptions"
+OPENAI_MAX_CONCURRENCY = int(os.environ.get("OPENAI_MAX_CONCURRENCY", "8"))
+OPENAI_REQUESTS_PER_MINUTE = int(os.environ.get("OPENAI_REQUESTS_PER_MINUTE", "50"))
+OPENAI_MAX_RETRIES = int(os.environ.get("OPENAI_MAX_RETRIES", "5"))
+MAX_BACKOFF_SECONDS = 30  # Longest wait between retries, even if Retry-After asks for more
+
+class AsyncRateLimiter:
+    """Token bucket allowing at most max_rate acquisitions per time_period seconds"""
+    
+    def __init__(self, max_rate: int, time_period: float = 60.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = float(max_rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                refill = (now - self._updated) * self.max_rate / self.time_period
+                self._tokens = min(self.max_rate, self._tokens + refill)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.time_period / self.max_rate)
+
+openai_semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+openai_rate_limiter = AsyncRateLimiter(OPENAI_REQUESTS_PER_MINUTE, 60)
+
+class ChunkDownloadError(Exception):
+    """Raised when a chunk's signed URL can't be fetched for transcription"""
+    
+    def __init__(self, status: int):
+        super().__init__(f"Chunk download failed with status {status}")
+        self.status = status
+
+class DriveMediaError(Exception):
+    """Raised when a Drive alt=media request returns an error status"""
+    
+    def __init__(self, status: int, error_text: str, retry_after: Optional[str] = None):
+        super().__init__(f"Drive media request failed: {status} - {error_text[:200]}")
+        self.status = status
+        self.retry_after = retry_after
+    
+    @property
+    def is_transient(self) -> bool:
+        return self.status == 429 or self.status >= 500
 
 # OpenAI Whisper compatible formats and size limits
 WHISPER_COMPATIBLE_FORMATS = {'.mp3', '.mp4', '.mpeg', '.mpga', '.m4a', '.wav', '.webm'}
 WHISPER_MAX_SIZE_MB = 25
+WHISPER_CONTENT_TYPES = {
+    '.mp3': 'audio/mpeg',
+    '.mp4': 'audio/mp4',
+    '.m4a': 'audio/mp4',
+    '.wav': 'audio/wav',
+    '.webm': 'audio/webm',
+    '.flac': 'audio/flac',
+    '.ogg': 'audio/ogg'
+}
+
+def get_audio_content_type(filename: str) -> str:
+    """Content type for an audio file sent to Whisper, by extension (MP3 if unknown)"""
+    return WHISPER_CONTENT_TYPES.get(os.path.splitext(filename)[1].lower(), 'audio/mpeg')
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Return the shared aiohttp session, creating it on first use.
+    Reusing one pooled session keeps DNS, TCP and TLS state warm across
+    Drive downloads, OpenAI calls and webhook deliveries.
+    """
+    session = getattr(app.state, "http_session", None)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=32,
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=300)  # 5 minute default, overridden per request
+        )
+        app.state.http_session = session
+    return session
 
 def needs_splitting(file_path: str, file_size_bytes: int, original_filename: str = None) -> bool:
     """
@@ -95,53 +242,90 @@ def needs_splitting(file_path: str, file_size_bytes: int, original_filename: str
     
     return not (is_compatible_format and is_under_size_limit)
 
+async def file_sender(file_path: str):
+    """
+    Yield a file from disk in STREAM_PIPE_CHUNK_SIZE slices for a streamed request body,
+    so the upload starts at once and the file is never held in memory
+    """
+    async with aiofiles.open(file_path, 'rb') as fh:
+        while True:
+            piece = await fh.read(STREAM_PIPE_CHUNK_SIZE)
+            if not piece:
+                return
+            yield piece
+
 async def transcribe_file_directly(file_path: str, api_key: str) -> Dict:
     """Transcribe a file directly without splitting"""
     logger.info(f"Transcribing file directly: {os.path.basename(file_path)}")
-    start_time = datetime.now()
+    start_time = time.monotonic()
     
-    async with aiohttp.ClientSession() as session:
-        with open(file_path, 'rb') as audio_file:
-            audio_data = audio_file.read()
-            filename = os.path.basename(file_path)
-            
-            # Determine content type
-            file_ext = os.path.splitext(filename.lower())[1]
-            content_type_map = {
-                '.mp3': 'audio/mpeg',
-                '.mp4': 'audio/mp4', 
-                '.m4a': 'audio/mp4',
-                '.wav': 'audio/wav',
-                '.webm': 'audio/webm'
-            }
-            content_type = content_type_map.get(file_ext, 'audio/mpeg')
-            
-            # Create form data
-            data = aiohttp.FormData()
-            data.add_field('file', audio_data, filename=filename, content_type=content_type)
-            data.add_field('model', 'whisper-1')
-            
-            logger.info(f"Sending {len(audio_data)/(1024*1024):.1f}MB file to OpenAI Whisper API")
-            
-            async with session.post(
-                'https://api.openai.com/v1/audio/transcriptions',
-                headers={"Authorization": f"Bearer {api_key}"},
-                data=data
-            ) as resp:
-                response_time = (datetime.now() - start_time).total_seconds()
-                
-                if resp.status == 200:
-                    result = await resp.json()
-                    logger.info(f"✅ Direct transcription successful in {response_time:.1f}s. Text length: {len(result['text'])} chars")
-                    return {
-                        "text": result['text'],
-                        "duration": get_audio_info(file_path)[0],  # Get duration from file
-                        "method": "direct"
-                    }
-                else:
-                    error_text = await resp.text()
-                    logger.error(f"❌ Direct transcription failed: {resp.status} - {error_text}")
-                    raise Exception(f"OpenAI API error: {resp.status} - {error_text}")
+    session = get_http_session()
+    file_size_bytes = os.stat(file_path).st_size
+    filename = os.path.basename(file_path)
+    
+    content_type = get_audio_content_type(filename)
+    
+    logger.info(f"Streaming {file_size_bytes/(1024*1024):.1f}MB file to OpenAI Whisper API")
+    
+    async def send_once():
+        # Form data is rebuilt per attempt since a streamed body can't be replayed
+        data = aiohttp.FormData()
+        data.add_field('file', file_sender(file_path), filename=filename, content_type=content_type)
+        data.add_field('model', 'whisper-1')
+        
+        async with session.post(
+            OPENAI_TRANSCRIPTIONS_URL,
+            headers={"Authorization": f"Bearer {api_key}"},
+            data=data
+        ) as resp:
+            if resp.status == 200:
+                return resp.status, await resp.json(loads=orjson.loads), None
+            return resp.status, await resp.text(), resp.headers.get("Retry-After")
+    
+    status, body = await post_transcription_with_retry(send_once, "Direct transcription")
+    response_time = time.monotonic() - start_time
+    
+    if status == 200:
+        logger.info(f"✅ Direct transcription successful in {response_time:.1f}s. Text length: {len(body['text'])} chars")
+        return {
+            "text": body['text'],
+            "duration": (await get_audio_info_async(file_path))[0],  # Get duration from file
+            "method": "direct"
+        }
+    else:
+        logger.error(f"❌ Direct transcription failed: {status} - {body}")
+        raise Exception(f"OpenAI API error: {status} - {body}")
+
+async def post_transcription_with_retry(send_once, label: str):
+    """
+    Run an OpenAI transcription request under the global concurrency and rate limits.
+    send_once() performs one attempt and returns (status, body, retry_after). Rate limits
+    (429), server errors (5xx), connection errors, timeouts and truncated responses are
+    retried with jittered exponential backoff, or as long as Retry-After asks (up to
+    MAX_BACKOFF_SECONDS).
+    Returns (status, body).
+    """
+    for attempt in range(OPENAI_MAX_RETRIES):
+        is_last_attempt = attempt == OPENAI_MAX_RETRIES - 1
+        retry_after = None
+        try:
+            async with openai_semaphore:
+                await openai_rate_limiter.acquire()
+                status, body, retry_after = await send_once()
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+            if is_last_attempt:
+                raise
+            logger.warning(f"{label}: OpenAI request failed (attempt {attempt + 1}): {str(e) or type(e).__name__}")
+        else:
+            if (status != 429 and status < 500) or is_last_attempt:
+                return status, body
+            logger.warning(f"{label}: OpenAI returned {status} (attempt {attempt + 1})")
+        
+        backoff_delay = min(2 ** attempt, MAX_BACKOFF_SECONDS) + random.uniform(0, 1)
+        if retry_after and retry_after.isdigit():
+            backoff_delay = min(int(retry_after), MAX_BACKOFF_SECONDS) + random.uniform(0, 1)
+        logger.info(f"{label}: Retrying OpenAI request in {backoff_delay:.1f} seconds...")
+        await asyncio.sleep(backoff_delay)
 
 class DriveFileRequest(BaseModel):
     """Request to process a file from Google Drive"""
@@ -214,17 +398,17 @@ class TranscriptionResult(BaseModel):
     transcription_folder: Optional[str] = None
     processed_folder: Optional[str] = None
 
+# Google Drive URL formats:
+#   https://drive.google.com/file/d/FILE_ID/view
+#   https://drive.google.com/open?id=FILE_ID
+DRIVE_FILE_ID_RE = re.compile(r'/file/d/([^/?#]+)|[?&]id=([^&#]+)')
+
 def extract_file_id_from_url(url: str) -> str:
     """Extract file ID from Google Drive URL"""
-    # Handle various Google Drive URL formats
-    if '/file/d/' in url:
-        # https://drive.google.com/file/d/FILE_ID/view
-        return url.split('/file/d/')[1].split('/')[0]
-    elif 'id=' in url:
-        # https://drive.google.com/open?id=FILE_ID
-        return url.split('id=')[1].split('&')[0]
-    else:
-        return url  # Assume it's already a file ID
+    match = DRIVE_FILE_ID_RE.search(url)
+    if match:
+        return match.group(1) or match.group(2)
+    return url  # Assume it's already a file ID
 
 def is_n8n_resume_url(webhook_url: str) -> bool:
     """Check if the webhook URL appears to be an n8n resume URL"""
@@ -242,9 +426,6 @@ def is_n8n_resume_url(webhook_url: str) -> bool:
 
 async def test_webhook_connectivity(webhook_url: str) -> Dict[str, any]:
     """Test webhook URL connectivity without sending the full payload"""
-    import time
-    from urllib.parse import urlparse
-    
     result = {
         "url": webhook_url,
         "is_n8n_url": is_n8n_resume_url(webhook_url),
@@ -260,24 +441,24 @@ async def test_webhook_connectivity(webhook_url: str) -> Dict[str, any]:
             result["error"] = "Invalid URL format"
             return result
             
-        start_time = time.time()
+        start_time = time.monotonic()
         timeout_config = aiohttp.ClientTimeout(total=10, connect=5)
         
-        async with aiohttp.ClientSession(timeout=timeout_config) as session:
-            # Try a HEAD request first to avoid triggering the webhook
-            async with session.head(webhook_url, allow_redirects=False) as response:
-                result["response_time"] = time.time() - start_time
-                result["status_code"] = response.status
-                result["reachable"] = response.status != 404
+        session = get_http_session()
+        # Try a HEAD request first to avoid triggering the webhook
+        async with session.head(webhook_url, allow_redirects=False, timeout=timeout_config) as response:
+            result["response_time"] = time.monotonic() - start_time
+            result["status_code"] = response.status
+            result["reachable"] = response.status != 404
+            
+            if response.status in [405, 501]:  # Method not allowed - endpoint exists but doesn't support HEAD
+                result["reachable"] = True
+                result["error"] = f"HEAD method not supported (status {response.status}) - endpoint likely exists"
+            elif response.status == 404:
+                result["error"] = "Webhook URL returns 404 - may be expired or invalid"
+            elif response.status >= 500:
+                result["error"] = f"Server error: {response.status}"
                 
-                if response.status in [405, 501]:  # Method not allowed - endpoint exists but doesn't support HEAD
-                    result["reachable"] = True
-                    result["error"] = f"HEAD method not supported (status {response.status}) - endpoint likely exists"
-                elif response.status == 404:
-                    result["error"] = "Webhook URL returns 404 - may be expired or invalid"
-                elif response.status >= 500:
-                    result["error"] = f"Server error: {response.status}"
-                    
     except asyncio.TimeoutError:
         result["error"] = "Connection timeout"
     except aiohttp.ClientConnectorError as e:
@@ -287,106 +468,460 @@ async def test_webhook_connectivity(webhook_url: str) -> Dict[str, any]:
     
     return result
 
-async def download_from_drive_stream(file_id: str, temp_path: str) -> Dict:
-    """Stream download from Google Drive to temporary file"""
+async def get_drive_access_token() -> str:
+    """Return a valid OAuth token for Drive, refreshing only once it has expired"""
+    if not credentials.valid:
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, credentials.refresh, GoogleAuthRequest())
+    return credentials.token
+
+async def with_drive_retry(operation, label: str):
+    """
+    Run a Drive media operation, retrying rate limits (429), server errors (5xx),
+    connection errors, truncated bodies and timeouts with jittered exponential backoff.
+    A 429 with Retry-After waits as long as Drive asks instead, up to MAX_BACKOFF_SECONDS.
+    """
+    for attempt in range(DRIVE_MAX_RETRIES):
+        try:
+            return await operation()
+        except (DriveMediaError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+            if isinstance(e, DriveMediaError) and not e.is_transient:
+                raise
+            if attempt == DRIVE_MAX_RETRIES - 1:
+                raise
+            
+            backoff_delay = min(2 ** attempt, MAX_BACKOFF_SECONDS) + random.uniform(0, 1)
+            if isinstance(e, DriveMediaError) and e.retry_after and e.retry_after.isdigit():
+                backoff_delay = min(int(e.retry_after), MAX_BACKOFF_SECONDS) + random.uniform(0, 1)
+            logger.warning(f"{label}: attempt {attempt + 1} failed ({str(e) or type(e).__name__}); retrying in {backoff_delay:.1f}s")
+            await asyncio.sleep(backoff_delay)
+
+async def download_single_stream(
+    session: aiohttp.ClientSession,
+    url: str,
+    params: Dict,
+    headers: Dict,
+    temp_path: str,
+    total_bytes: int
+):
+    """Download a whole file with one streaming GET"""
+    async with session.get(url, params=params, headers=headers, timeout=DRIVE_DOWNLOAD_TIMEOUT) as resp:
+        if resp.status != 200:
+            raise DriveMediaError(resp.status, await resp.text(), resp.headers.get("Retry-After"))
+        
+        downloaded = 0
+        log_progress = total_bytes and logger.isEnabledFor(logging.INFO)
+        last_logged_pct = 0
+        last_logged_at = time.monotonic()
+        buffer = bytearray()
+        async with aiofiles.open(temp_path, 'wb') as fh:
+            async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                buffer += chunk
+                if len(buffer) >= DISK_WRITE_BUFFER_SIZE:
+                    await fh.write(buffer)
+                    buffer.clear()
+                downloaded += len(chunk)
+                if log_progress:
+                    # Log every 10% or every 5s, whichever comes first
+                    pct = downloaded * 100 // total_bytes
+                    now = time.monotonic()
+                    if pct - last_logged_pct >= 10 or now - last_logged_at >= 5:
+                        logger.info(f"Download progress: {pct}%")
+                        last_logged_pct = pct
+                        last_logged_at = now
+            if buffer:
+                await fh.write(buffer)
+
+async def download_ranges_parallel(
+    session: aiohttp.ClientSession,
+    url: str,
+    params: Dict,
+    headers: Dict,
+    temp_path: str,
+    total_bytes: int
+):
+    """
+    Download a large file as concurrent byte ranges written into a pre-sized file.
+    Several connections hide the per-connection bandwidth cap of Google's frontend.
+    """
+    range_size = PARALLEL_DOWNLOAD_RANGE_SIZE
+    ranges = [
+        (i * range_size, min((i + 1) * range_size, total_bytes) - 1)
+        for i in range(math.ceil(total_bytes / range_size))
+    ]
+    semaphore = asyncio.Semaphore(PARALLEL_DOWNLOAD_CONCURRENCY)
+    loop = asyncio.get_event_loop()
+    
+    logger.info(f"Parallel download: {len(ranges)} ranges, {PARALLEL_DOWNLOAD_CONCURRENCY} concurrent connections")
+    
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.ftruncate(fd, total_bytes)
+        
+        async def fetch_range(start: int, end: int):
+            range_headers = {**headers, "Range": f"bytes={start}-{end}"}
+            async with semaphore:
+                async with session.get(url, params=params, headers=range_headers, timeout=DRIVE_DOWNLOAD_TIMEOUT) as resp:
+                    if resp.status != 206:
+                        raise DriveMediaError(resp.status, await resp.text(), resp.headers.get("Retry-After"))
+                    
+                    offset = start
+                    buffer = bytearray()
+                    async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        buffer += chunk
+                        if len(buffer) >= DISK_WRITE_BUFFER_SIZE:
+                            await loop.run_in_executor(None, os.pwrite, fd, buffer, offset)
+                            offset += len(buffer)
+                            buffer.clear()
+                    if buffer:
+                        await loop.run_in_executor(None, os.pwrite, fd, buffer, offset)
+                        offset += len(buffer)
+                    
+                    if offset != end + 1:
+                        raise aiohttp.ClientPayloadError(f"Range {start}-{end} truncated at byte {offset}")
+        
+        # Each range retries on its own, so one flaky connection doesn't restart the whole file
+        tasks = [
+            asyncio.create_task(with_drive_retry(
+                lambda start=start, end=end: fetch_range(start, end), f"Drive range {start}-{end}"
+            ))
+            for start, end in ranges
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Stop the other ranges before the descriptor they write to is closed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+    finally:
+        os.close(fd)
+    
+    logger.info(f"Parallel download complete: {total_bytes / (1024 * 1024):.1f}MB")
+
+def get_drive_http() -> AuthorizedHttp:
+    """
+    Authorized transport for Drive API calls on the current thread. httplib2
+    connections are not thread-safe, so each executor thread keeps its own and
+    reuses it, keeping the TLS connection to Drive warm across jobs.
+    """
+    http = getattr(DRIVE_HTTP, "http", None)
+    if http is None:
+        http = DRIVE_HTTP.http = AuthorizedHttp(credentials, http=httplib2.Http(timeout=DRIVE_API_TIMEOUT))
+    return http
+
+def get_drive_file_metadata(file_id: str) -> Dict:
+    """Get file metadata (with shared drive support); blocking, see get_drive_file_metadata_async"""
     if not drive_service:
         raise HTTPException(status_code=500, detail="Google Drive service not configured")
     
+    return drive_service.files().get(
+        fileId=file_id,
+        fields='name,size,mimeType,md5Checksum',
+        supportsAllDrives=True
+    ).execute(http=get_drive_http(), num_retries=DRIVE_MAX_RETRIES)
+
+async def get_drive_file_metadata_async(file_id: str) -> Dict:
+    """Get file metadata without blocking the event loop"""
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, get_drive_file_metadata, file_id)
+
+async def get_audio_info_async(file_path: str):
+    """Run the ffprobe-backed get_audio_info without blocking the event loop"""
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, get_audio_info, file_path)
+
+async def get_drive_media_request(file_id: str):
+    """Return the URL, query params and auth headers of an alt=media GET for the file"""
+    token = await get_drive_access_token()
+    media_url = f"{DRIVE_FILES_URL}/{file_id}"
+    params = {"alt": "media", "supportsAllDrives": "true"}
+    headers = {"Authorization": f"Bearer {token}"}
+    return media_url, params, headers
+
+async def stream_drive_media(file_id: str):
+    """Yield the file body from Drive as it arrives, without touching disk"""
+    media_url, params, headers = await get_drive_media_request(file_id)
+    session = get_http_session()
+    
+    async def open_media():
+        resp = await session.get(media_url, params=params, headers=headers, timeout=DRIVE_DOWNLOAD_TIMEOUT)
+        if resp.status != 200:
+            async with resp:
+                raise DriveMediaError(resp.status, await resp.text(), resp.headers.get("Retry-After"))
+        return resp
+    
+    # Only opening the stream is retried; once bytes reach ffmpeg they can't be replayed
+    resp = await with_drive_retry(open_media, f"Drive media {file_id}")
+    async with resp:
+        async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+            yield chunk
+
+async def probe_drive_audio(file_id: str, file_size_bytes: int):
+    """
+    Probe codec and bitrate from the first bytes of a Drive file.
+    Returns (duration, bitrate, codec_name) with the duration estimated from the file size.
+    Raises ValueError when the head can't be parsed or carries no bitrate.
+    """
+    media_url, params, headers = await get_drive_media_request(file_id)
+    range_headers = {**headers, "Range": f"bytes=0-{PIPE_PROBE_BYTES - 1}"}
+    session = get_http_session()
+    
+    async def fetch_head():
+        async with session.get(media_url, params=params, headers=range_headers, timeout=DRIVE_DOWNLOAD_TIMEOUT) as resp:
+            if resp.status not in (200, 206):
+                raise DriveMediaError(resp.status, await resp.text(), resp.headers.get("Retry-After"))
+            return await resp.content.read(PIPE_PROBE_BYTES)
+    
+    head = await with_drive_retry(fetch_head, f"Drive probe {file_id}")
+    bitrate, codec_name = await probe_audio_bytes(head)
+    if not bitrate:
+        raise ValueError("no bitrate in the file header")
+    return file_size_bytes * 8 / bitrate, bitrate, codec_name
+
+def can_pipe_split(file_name: str) -> bool:
+    """Check whether a Drive file can be split straight from its HTTP stream"""
+    return DRIVE_PIPE_SPLIT and os.path.splitext(file_name.lower())[1] in PIPE_SPLIT_EXTENSIONS
+
+async def download_from_drive_stream(file_id: str, temp_path: str, file_metadata: Optional[Dict] = None) -> Dict:
+    """Stream download from Google Drive to temporary file"""
     try:
-        # Get file metadata (with shared drive support)
-        file_metadata = drive_service.files().get(
-            fileId=file_id,
-            fields='name,size,mimeType',
-            supportsAllDrives=True
-        ).execute()
-        
-        # Stream download the file (with shared drive support)
-        request = drive_service.files().get_media(fileId=file_id, supportsAllDrives=True)
-        
-        with open(temp_path, 'wb') as fh:
-            downloader = MediaIoBaseDownload(fh, request, chunksize=10*1024*1024)  # 10MB chunks
-            done = False
-            while not done:
-                status, done = downloader.next_chunk()
-                if status:
-                    logger.info(f"Download progress: {int(status.progress() * 100)}%")
+        if file_metadata is None:
+            file_metadata = await get_drive_file_metadata_async(file_id)
+        
+        # Stream the body with alt=media GETs instead of one request per chunk
+        media_url, params, headers = await get_drive_media_request(file_id)
+        total_bytes = int(file_metadata.get('size', 0))
+        
+        session = get_http_session()
+        if total_bytes > PARALLEL_DOWNLOAD_THRESHOLD_MB * 1024 * 1024:
+            await download_ranges_parallel(session, media_url, params, headers, temp_path, total_bytes)
+        else:
+            await with_drive_retry(
+                lambda: download_single_stream(session, media_url, params, headers, temp_path, total_bytes),
+                f"Drive download {file_id}"
+            )
         
         return file_metadata
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error downloading from Drive: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Failed to download from Drive: {str(e)}")
 
-async def upload_to_gcs_async(local_path: str, gcs_path: str) -> str:
-    """Async wrapper for GCS upload"""
-    loop = asyncio.get_event_loop()
-    blob = bucket.blob(gcs_path)
-    
-    await loop.run_in_executor(None, blob.upload_from_filename, local_path)
-    
-    # Generate signed URL with proper arguments
-    generate_url_func = partial(
-        blob.generate_signed_url,
+async def run_bounded(semaphore: asyncio.Semaphore, coro):
+    """Await a coroutine while holding a slot in the given semaphore"""
+    async with semaphore:
+        return await coro
+
+def get_signing_credentials():
+    """
+    Credentials for V4 URL signing. The service account key signs locally; default
+    credentials (e.g. Cloud Run) have no private key, so an IAM signer is built
+    once and reused for every URL instead of per job.
+    """
+    global signing_credentials
+    if signing_credentials is None:
+        with SIGNING_LOCK:
+            if signing_credentials is None:
+                auth_request = GoogleAuthRequest()
+                source_credentials, _ = google.auth.default(scopes=['https://www.googleapis.com/auth/cloud-platform'])
+                # Compute Engine credentials only learn their email on first refresh
+                source_credentials.refresh(auth_request)
+                email = source_credentials.service_account_email
+                signing_credentials = service_account.Credentials(
+                    iam.Signer(auth_request, source_credentials, email),
+                    email,
+                    token_uri="https://oauth2.googleapis.com/token"
+                )
+    return signing_credentials
+
+def sign_blob_url(blob) -> str:
+    """Generate a V4 signed GET URL for a blob"""
+    return blob.generate_signed_url(
         version="v4",
         expiration=timedelta(hours=SIGNED_URL_EXPIRY_HOURS),
-        method="GET"
+        method="GET",
+        credentials=get_signing_credentials()
     )
-    url = await loop.run_in_executor(None, generate_url_func)
-    return url
+
+def upload_file_to_gcs(local_path: str, gcs_path: str):
+    """Upload a file to GCS (blocking)"""
+    blob = bucket.blob(gcs_path)
+    # Resumable upload streamed from disk in GCS_UPLOAD_CHUNK_SIZE windows: memory stays
+    # bounded and a network blip resumes from the last window instead of byte zero
+    blob.chunk_size = GCS_UPLOAD_CHUNK_SIZE
+    content_type = mimetypes.guess_type(local_path)[0] or 'application/octet-stream'
+    with open(local_path, 'rb') as fh:
+        blob.upload_from_file(
+            fh,
+            rewind=True,
+            size=os.fstat(fh.fileno()).st_size,
+            content_type=content_type,
+            checksum='crc32c',
+            retry=GCS_RETRY
+        )
+
+def upload_text_and_sign(text: str, gcs_path: str) -> str:
+    """Upload a string to GCS and return its signed URL (blocking)"""
+    blob = bucket.blob(gcs_path)
+    blob.upload_from_string(text, retry=GCS_RETRY)
+    return sign_blob_url(blob)
+
+def upload_text_parts_and_sign(parts: List[str], gcs_path: str) -> str:
+    """
+    Write text parts, separated by blank lines, to a temp file and upload it to GCS
+    without joining them into one string first (blocking)
+    """
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.txt') as fh:
+        for i, part in enumerate(parts):
+            if i:
+                fh.write("\n\n")
+            fh.write(part)
+        fh.flush()
+        blob = bucket.blob(gcs_path)
+        blob.upload_from_filename(fh.name, content_type='text/plain', retry=GCS_RETRY)
+    return sign_blob_url(blob)
+
+async def upload_to_gcs_async(local_path: str, gcs_path: str) -> str:
+    """
+    Upload a file to GCS and return its signed URL. A V4 signature only needs the
+    object path, so signing (an IAM round trip without a local key) runs alongside
+    the upload instead of after it.
+    """
+    loop = asyncio.get_event_loop()
+    _, signed_url = await asyncio.gather(
+        loop.run_in_executor(GCS_POOL, upload_file_to_gcs, local_path, gcs_path),
+        loop.run_in_executor(GCS_POOL, sign_blob_url, bucket.blob(gcs_path))
+    )
+    return signed_url
+
+async def upload_text_to_gcs_async(text: str, gcs_path: str) -> str:
+    """Async wrapper for uploading a transcript string to GCS"""
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(GCS_POOL, upload_text_and_sign, text, gcs_path)
+
+def get_transcript_cache_key(md5_checksum: str, request: DriveFileRequest) -> str:
+    """Cache key for a Drive file's transcript under the settings that shape it"""
+    return f"{md5_checksum}/{request.output_format}_{request.quality}_{request.max_size_mb}"
+
+def read_manifest(cache_key: str) -> Optional[Dict]:
+    """Read a cached transcript manifest from GCS, or None on a miss (blocking)"""
+    try:
+        data = bucket.blob(f"{TRANSCRIPT_CACHE_PREFIX}{cache_key}/manifest.json").download_as_bytes(retry=GCS_RETRY)
+    except NotFound:
+        return None
+    return orjson.loads(data)
+
+def write_manifest(cache_key: str, manifest: Dict):
+    """Write a transcript manifest to GCS (blocking)"""
+    blob = bucket.blob(f"{TRANSCRIPT_CACHE_PREFIX}{cache_key}/manifest.json")
+    blob.upload_from_string(orjson.dumps(manifest), content_type='application/json', retry=GCS_RETRY)
+
+async def load_transcript_manifest(cache_key: str) -> Optional[Dict]:
+    """Async wrapper for reading a cached transcript manifest"""
+    loop = asyncio.get_event_loop()
+    try:
+        return await loop.run_in_executor(GCS_POOL, read_manifest, cache_key)
+    except Exception as e:
+        logger.warning(f"Transcript cache lookup failed for {cache_key}: {str(e)}")
+        return None
+
+async def save_transcript_manifest(cache_key: str, manifest: Dict):
+    """Async wrapper for caching a transcript manifest; failures only log"""
+    loop = asyncio.get_event_loop()
+    try:
+        await loop.run_in_executor(GCS_POOL, write_manifest, cache_key, manifest)
+    except Exception as e:
+        logger.warning(f"Failed to cache transcript manifest for {cache_key}: {str(e)}")
+
+def claim_inflight(cache_key: str) -> Optional[asyncio.Event]:
+    """
+    Claim the cache key for this job. Returns None when claimed, or the Event of the
+    job already processing the same file
+    """
+    event = INFLIGHT_JOBS.get(cache_key)
+    if event is None:
+        INFLIGHT_JOBS[cache_key] = asyncio.Event()
+    return event
+
+def release_inflight(cache_key: str):
+    """Release a claimed cache key and wake any jobs waiting on it"""
+    event = INFLIGHT_JOBS.pop(cache_key, None)
+    if event is not None:
+        event.set()
+
+async def upload_text_parts_to_gcs_async(parts: List[str], gcs_path: str) -> str:
+    """Async wrapper for uploading a transcript made of several parts to GCS"""
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(GCS_POOL, upload_text_parts_and_sign, parts, gcs_path)
+
+def collect_in_order(transcriptions: List[Dict]) -> List[str]:
+    """
+    Place each chunk's text in its slot by chunk_number (1..N) instead of sorting.
+    Falls back to the submitted order if the numbers aren't a 1..N sequence.
+    """
+    texts = [None] * len(transcriptions)
+    for position, transcription in enumerate(transcriptions):
+        slot = transcription.get('chunk_number', position + 1) - 1
+        if not 0 <= slot < len(texts) or texts[slot] is not None:
+            return [t['text'] for t in transcriptions]
+        texts[slot] = transcription['text']
+    return texts
 
 async def transcribe_chunks_parallel(chunks: List[Dict], api_key: str) -> List[Dict]:
     """Transcribe multiple chunks in parallel using OpenAI"""
-    start_time = datetime.now()
+    start_time = time.monotonic()
     logger.info(f"Starting parallel transcription of {len(chunks)} chunks")
     
-    async with aiohttp.ClientSession(
-        timeout=aiohttp.ClientTimeout(total=300)  # 5 minute timeout
-    ) as session:
-        tasks = []
-        for i, chunk in enumerate(chunks):
-            logger.info(f"Creating transcription task {i+1}/{len(chunks)} for chunk {chunk.get('chunk_number', 'unknown')}")
-            task = transcribe_single_chunk(session, chunk, api_key)
-            tasks.append(task)
+    session = get_http_session()
+    tasks = []
+    for i, chunk in enumerate(chunks):
+        logger.info(f"Creating transcription task {i+1}/{len(chunks)} for chunk {chunk.get('chunk_number', 'unknown')}")
+        task = transcribe_single_chunk(session, chunk, api_key)
+        tasks.append(task)
+    
+    logger.info(f"All {len(tasks)} transcription tasks created, starting parallel execution...")
+    
+    try:
+        results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        logger.info(f"All {len(tasks)} transcription tasks created, starting parallel execution...")
+        # Process results and log summary
+        successful = 0
+        failed = 0
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                logger.error(f"Task {i+1} failed with exception: {result}")
+                failed += 1
+            elif result.get('text', '').startswith('[Error'):
+                logger.warning(f"Task {i+1} completed with error: {result.get('text', '')[:50]}...")
+                failed += 1
+            else:
+                successful += 1
         
-        try:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Process results and log summary
-            successful = 0
-            failed = 0
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    logger.error(f"Task {i+1} failed with exception: {result}")
-                    failed += 1
-                elif result.get('text', '').startswith('[Error'):
-                    logger.warning(f"Task {i+1} completed with error: {result.get('text', '')[:50]}...")
-                    failed += 1
-                else:
-                    successful += 1
-            
-            total_time = (datetime.now() - start_time).total_seconds()
-            logger.info(f"Parallel transcription completed in {total_time:.1f}s: {successful} successful, {failed} failed")
-            
-            # Convert exceptions to error results
-            processed_results = []
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    processed_results.append({
-                        "chunk_number": i + 1,
-                        "text": f"[Task Exception: {str(result)[:100]}]",
-                        "duration": 0
-                    })
-                else:
-                    processed_results.append(result)
-            
-            return processed_results
-            
-        except Exception as e:
-            total_time = (datetime.now() - start_time).total_seconds()
-            logger.error(f"Fatal error in parallel transcription after {total_time:.1f}s: {str(e)}")
-            raise
+        total_time = time.monotonic() - start_time
+        logger.info(f"Parallel transcription completed in {total_time:.1f}s: {successful} successful, {failed} failed")
+        
+        # Convert exceptions to error results
+        processed_results = []
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                processed_results.append({
+                    "chunk_number": chunks[i].get('chunk_number', i + 1),
+                    "text": f"[Task Exception: {str(result)[:100]}]",
+                    "duration": 0
+                })
+            else:
+                processed_results.append(result)
+        
+        return processed_results
+        
+    except Exception as e:
+        total_time = time.monotonic() - start_time
+        logger.error(f"Fatal error in parallel transcription after {total_time:.1f}s: {str(e)}")
+        raise
 
 async def transcribe_single_chunk(session: aiohttp.ClientSession, chunk: Dict, api_key: str) -> Dict:
     """Transcribe a single chunk using OpenAI API"""
@@ -395,67 +930,75 @@ async def transcribe_single_chunk(session: aiohttp.ClientSession, chunk: Dict, a
     download_url = chunk['download_url']
     
     logger.info(f"Starting transcription for chunk {chunk_num}: {filename}")
-    start_time = datetime.now()
+    start_time = time.monotonic()
     
-    try:
-        # Download chunk to memory
-        logger.info(f"Chunk {chunk_num}: Downloading from {download_url[:50]}...")
-        async with session.get(download_url) as resp:
-            if resp.status != 200:
-                logger.error(f"Chunk {chunk_num}: Failed to download audio data. Status: {resp.status}")
-                return {
-                    "chunk_number": chunk_num,
-                    "text": f"[Download Error: {resp.status}]",
-                    "duration": chunk.get('duration_seconds', 0)
-                }
+    content_type = get_audio_content_type(filename)
+    logger.info(f"Chunk {chunk_num}: Using content-type {content_type}")
+    
+    async def send_once():
+        # Stream the chunk from GCS straight into the OpenAI request body;
+        # the GET is repeated per attempt because a streamed body can't be replayed
+        logger.info(f"Chunk {chunk_num}: Streaming from {download_url[:50]}...")
+        async with session.get(download_url) as download_resp:
+            if download_resp.status != 200:
+                raise ChunkDownloadError(download_resp.status)
             
-            audio_data = await resp.read()
-            audio_size_mb = len(audio_data) / (1024 * 1024)
-            logger.info(f"Chunk {chunk_num}: Downloaded {audio_size_mb:.1f}MB audio data")
-        
-        # Determine content type based on filename
-        content_type = 'audio/mp4' if filename.endswith('.m4a') else 'audio/mpeg'
-        logger.info(f"Chunk {chunk_num}: Using content-type {content_type}")
-        
-        # Create form data
-        data = aiohttp.FormData()
-        data.add_field('file', audio_data, filename=filename, content_type=content_type)
-        data.add_field('model', 'whisper-1')
-        
-        # Send to OpenAI
-        logger.info(f"Chunk {chunk_num}: Sending {audio_size_mb:.1f}MB to OpenAI Whisper API")
+            audio_size_mb = (download_resp.content_length or 0) / (1024 * 1024)
+            
+            async def audio_sender():
+                async for piece in download_resp.content.iter_chunked(STREAM_PIPE_CHUNK_SIZE):
+                    yield piece
+            
+            # Create form data
+            data = aiohttp.FormData()
+            data.add_field('file', audio_sender(), filename=filename, content_type=content_type)
+            data.add_field('model', 'whisper-1')
+            
+            # Send to OpenAI
+            logger.info(f"Chunk {chunk_num}: Streaming {audio_size_mb:.1f}MB to OpenAI Whisper API")
+            
+            async with session.post(
+                OPENAI_TRANSCRIPTIONS_URL,
+                headers={"Authorization": f"Bearer {api_key}"},
+                data=data
+            ) as resp:
+                if resp.status == 200:
+                    return resp.status, await resp.json(loads=orjson.loads), None
+                return resp.status, await resp.text(), resp.headers.get("Retry-After")
+    
+    try:
+        status, body = await post_transcription_with_retry(send_once, f"Chunk {chunk_num}")
+        response_time = time.monotonic() - start_time
         
-        async with session.post(
-            'https://api.openai.com/v1/audio/transcriptions',
-            headers={"Authorization": f"Bearer {api_key}"},
-            data=data
-        ) as resp:
-            response_time = (datetime.now() - start_time).total_seconds()
+        if status == 200:
+            text_length = len(body['text'])
+            logger.info(f"Chunk {chunk_num}: ✅ Transcription successful in {response_time:.1f}s. Text length: {text_length} chars")
+            logger.info(f"Chunk {chunk_num}: First 100 chars: {body['text'][:100]}...")
             
-            if resp.status == 200:
-                result = await resp.json()
-                text_length = len(result['text'])
-                logger.info(f"Chunk {chunk_num}: ✅ Transcription successful in {response_time:.1f}s. Text length: {text_length} chars")
-                logger.info(f"Chunk {chunk_num}: First 100 chars: {result['text'][:100]}...")
-                
-                return {
-                    "chunk_number": chunk_num,
-                    "text": result['text'],
-                    "duration": chunk.get('duration_seconds', 0)
-                }
-            else:
-                error_text = await resp.text()
-                logger.error(f"Chunk {chunk_num}: ❌ OpenAI API failed with status {resp.status} in {response_time:.1f}s")
-                logger.error(f"Chunk {chunk_num}: Error response: {error_text}")
-                
-                return {
-                    "chunk_number": chunk_num,
-                    "text": f"[OpenAI Error {resp.status}: {error_text[:100]}]",
-                    "duration": chunk.get('duration_seconds', 0)
-                }
+            return {
+                "chunk_number": chunk_num,
+                "text": body['text'],
+                "duration": chunk.get('duration_seconds', 0)
+            }
+        else:
+            logger.error(f"Chunk {chunk_num}: ❌ OpenAI API failed with status {status} in {response_time:.1f}s")
+            logger.error(f"Chunk {chunk_num}: Error response: {body}")
+            
+            return {
+                "chunk_number": chunk_num,
+                "text": f"[OpenAI Error {status}: {body[:100]}]",
+                "duration": chunk.get('duration_seconds', 0)
+            }
     
+    except ChunkDownloadError as e:
+        logger.error(f"Chunk {chunk_num}: Failed to download audio data. Status: {e.status}")
+        return {
+            "chunk_number": chunk_num,
+            "text": f"[Download Error: {e.status}]",
+            "duration": chunk.get('duration_seconds', 0)
+        }
     except Exception as e:
-        response_time = (datetime.now() - start_time).total_seconds()
+        response_time = time.monotonic() - start_time
         logger.error(f"Chunk {chunk_num}: ❌ Exception during transcription after {response_time:.1f}s: {str(e)}")
         return {
             "chunk_number": chunk_num,
@@ -467,15 +1010,28 @@ async def process_file_async(
     job_id: str,
     file_name: str,
     file_size_bytes: int,
-    temp_input_path: str,
+    temp_input_path: Optional[str],
     request: DriveFileRequest,
-    webhook_url: Optional[str] = None
+    webhook_url: Optional[str] = None,
+    pipe_file_id: Optional[str] = None,
+    audio_info: Optional[tuple] = None,
+    cache_key: Optional[str] = None,
+    cached_manifest: Optional[Dict] = None,
+    wait_for: Optional[asyncio.Event] = None
 ):
     """
     Asynchronously process file - either direct transcription or split+transcribe
     This runs in the background and sends webhook when complete
+    
+    When pipe_file_id is given nothing was downloaded: the Drive file is streamed
+    straight into ffmpeg and audio_info holds the probed (duration, bitrate, codec_name)
+    
+    cache_key identifies the transcript cache entry. A cached_manifest is returned
+    as-is; with wait_for the job waits for another job on the same file and then
+    returns its cached result. Otherwise this job owns the key and writes the manifest.
     """
-    start_time = datetime.now()
+    owns_cache_key = cache_key is not None and cached_manifest is None and wait_for is None
+    start_time = time.monotonic()
     
     # Log webhook URL details at the start
     if webhook_url:
@@ -492,8 +1048,40 @@ async def process_file_async(
         if not api_key:
             raise Exception("OpenAI API key required")
         
+        if wait_for is not None:
+            logger.info(f"Job {job_id}: Waiting for in-flight job on the same file")
+            await wait_for.wait()
+            cached_manifest = await load_transcript_manifest(cache_key)
+            if not cached_manifest:
+                raise Exception("In-flight job for the same file did not complete - resubmit to retry")
+        
+        if cached_manifest:
+            # Same file already transcribed: re-sign the stored transcript
+            logger.info(f"Job {job_id}: Returning cached transcription for md5 {cache_key}")
+            loop = asyncio.get_event_loop()
+            transcription_url = await loop.run_in_executor(
+                GCS_POOL, sign_blob_url, bucket.blob(cached_manifest['transcription_path'])
+            )
+            result = TranscriptionResult(
+                job_id=job_id,
+                status="completed",
+                file_name=file_name,
+                transcription_text=cached_manifest['transcription_text'],
+                total_duration_seconds=cached_manifest['total_duration_seconds'],
+                processing_method=cached_manifest['processing_method'],
+                chunks_processed=cached_manifest['chunks_processed'],
+                processing_time_seconds=time.monotonic() - start_time,
+                transcription_url=transcription_url,
+                webhook_delivered=None,  # Will be updated after webhook attempt
+                # Pass through parameters from request
+                drive_file_id=request.drive_file_id,
+                source_folder=request.source_folder,
+                transcription_folder=request.transcription_folder,
+                processed_folder=request.processed_folder
+            )
+        
         # Check if file needs splitting
-        if not needs_splitting(temp_input_path, file_size_bytes, file_name):
+        elif not pipe_file_id and not needs_splitting(temp_input_path, file_size_bytes, file_name):
             # Direct transcription path
             logger.info(f"Job {job_id}: Processing via direct transcription")
             
@@ -501,18 +1089,8 @@ async def process_file_async(
             
             # Upload transcription to GCS
             transcription_path = f"transcriptions/{job_id}/direct_transcript.txt"
-            transcription_blob = bucket.blob(transcription_path)
-            transcription_blob.upload_from_string(transcription_result['text'])
-            
-            # Generate signed URL
-            generate_url_func = partial(
-                transcription_blob.generate_signed_url,
-                version="v4",
-                expiration=timedelta(hours=SIGNED_URL_EXPIRY_HOURS),
-                method="GET"
-            )
-            loop = asyncio.get_event_loop()
-            transcription_url = await loop.run_in_executor(None, generate_url_func)
+            transcription_url = await upload_text_to_gcs_async(transcription_result['text'], transcription_path)
+            cacheable = True
             
             # Create final result
             result = TranscriptionResult(
@@ -523,7 +1101,7 @@ async def process_file_async(
                 total_duration_seconds=transcription_result['duration'],
                 processing_method="direct_transcription",
                 chunks_processed=1,
-                processing_time_seconds=(datetime.now() - start_time).total_seconds(),
+                processing_time_seconds=time.monotonic() - start_time,
                 transcription_url=transcription_url,
                 webhook_delivered=None,  # Will be updated after webhook attempt
                 # Pass through parameters from request
@@ -538,50 +1116,87 @@ async def process_file_async(
             logger.info(f"Job {job_id}: Processing via split and transcribe")
             
             # Analyze audio
-            duration, bitrate, codec_name = get_audio_info(temp_input_path)
+            if pipe_file_id:
+                duration, bitrate, codec_name = audio_info
+            else:
+                duration, bitrate, codec_name = await get_audio_info_async(temp_input_path)
             
             # Determine output format
             output_format = request.output_format
             if output_format == "auto":
-                output_format = get_optimal_output_format(temp_input_path, detected_codec=codec_name)
+                output_format = get_optimal_output_format(temp_input_path or "", detected_codec=codec_name)
                 if output_format == "ogg":
                     output_format = "m4a"  # Better OpenAI compatibility
             
+            # Input already in the output codec: cut chunks without re-encoding
+            stream_copy = can_stream_copy(codec_name, output_format) and bool(bitrate)
+            
             # Calculate chunk duration
-            quality_bitrates = {'high': 128, 'medium': 96, 'low': 64}
-            output_bitrate = quality_bitrates.get(request.quality, 96)
+            output_bitrate = QUALITY_BITRATES_KBPS.get(request.quality, 96)
+            if stream_copy:
+                # Copied chunks keep the source bitrate, so size them by it
+                output_bitrate = bitrate / 1000
+                logger.info(f"Job {job_id}: Input codec {codec_name} matches {output_format}, using stream copy")
             chunk_duration = calculate_chunk_duration(bitrate, request.max_size_mb, output_format, output_bitrate)
             
-            # Split audio
+            # Split audio (segment splits cut on packet boundaries, so only
+            # ranged splits have a chunk count known up front)
+            expected_chunks = None
             with tempfile.TemporaryDirectory() as chunk_temp_dir:
                 output_dir = os.path.join(chunk_temp_dir, "chunks")
                 os.makedirs(output_dir, exist_ok=True)
                 
-                loop = asyncio.get_event_loop()
-                created_files = await loop.run_in_executor(
-                    executor,
-                    split_audio,
-                    temp_input_path,
-                    chunk_duration,
-                    output_dir,
-                    output_format,
-                    request.quality,
-                    False,
-                    None,
-                    False
-                )
+                if pipe_file_id:
+                    # Single ffmpeg segment pass fed directly from the Drive response
+                    chunks = await split_audio_stream(
+                        stream_drive_media(pipe_file_id),
+                        chunk_duration,
+                        output_dir,
+                        output_format,
+                        request.quality,
+                        stream_copy=stream_copy
+                    )
+                elif stream_copy:
+                    # Copying is I/O-bound: one segment pass beats N seeking invocations
+                    chunks = await split_audio_segments(
+                        temp_input_path,
+                        chunk_duration,
+                        output_dir,
+                        output_format,
+                        request.quality,
+                        stream_copy=True
+                    )
+                else:
+                    # One ffmpeg process per time range, spread across all cores
+                    expected_chunks = math.ceil(duration / chunk_duration)
+                    chunks = await split_audio_parallel(
+                        temp_input_path,
+                        chunk_duration,
+                        output_dir,
+                        output_format,
+                        request.quality,
+                        duration=duration,
+                        stream_copy=stream_copy
+                    )
+                
+                created_files = [chunk_path for chunk_path, _, _ in chunks]
                 
                 # Process chunks with streaming transcription
                 chunks_info = []
                 
                 logger.info(f"Job {job_id}: Starting streaming transcription of {len(created_files)} chunks")
                 
+                # Stat chunks up front so the upload fan-out only does network work
+                chunk_sizes = [os.stat(chunk_path).st_size for chunk_path in created_files]
+                upload_semaphore = asyncio.Semaphore(GCS_UPLOAD_CONCURRENCY)
+                
                 # Create tasks for upload and transcription
                 tasks = []
-                for i, chunk_path in enumerate(created_files):
-                    task = process_chunk_with_transcription(
-                        i, chunk_path, job_id, chunk_duration, duration, api_key
-                    )
+                for i, (chunk_path, chunk_start, chunk_length) in enumerate(chunks):
+                    task = asyncio.create_task(process_chunk_with_transcription(
+                        i, chunk_path, job_id, chunk_start, chunk_length, api_key,
+                        chunk_sizes[i], upload_semaphore
+                    ))
                     tasks.append(task)
                 
                 # Process chunks in parallel
@@ -590,10 +1205,15 @@ async def process_file_async(
                 # Collect results
                 successful_transcriptions = []
                 total_duration_processed = 0
+                failed_chunks = 0
                 
                 for result in results:
                     if isinstance(result, Exception):
                         logger.error(f"Job {job_id}: Chunk processing failed: {result}")
+                        failed_chunks += 1
+                        continue
+                    if result['chunk_info'] is None:
+                        failed_chunks += 1
                         continue
                     
                     chunks_info.append(result['chunk_info'])
@@ -601,27 +1221,28 @@ async def process_file_async(
                         successful_transcriptions.append(result['transcription'])
                         total_duration_processed += result['transcription']['duration']
                 
-                # Combine transcriptions
+                # Combine transcriptions (gather returns results in chunk order)
                 if successful_transcriptions:
-                    full_text = "\n\n".join([
-                        t['text'] for t in sorted(successful_transcriptions, key=lambda x: x['chunk_number'])
-                    ])
+                    full_text = "\n\n".join([t['text'] for t in successful_transcriptions])
                 else:
                     full_text = "[No successful transcriptions]"
                 
                 # Upload combined transcription
                 transcription_path = f"transcriptions/{job_id}/full_transcript.txt"
-                transcription_blob = bucket.blob(transcription_path)
-                transcription_blob.upload_from_string(full_text)
-                
-                generate_url_func = partial(
-                    transcription_blob.generate_signed_url,
-                    version="v4",
-                    expiration=timedelta(hours=SIGNED_URL_EXPIRY_HOURS),
-                    method="GET"
+                transcription_url = await upload_text_to_gcs_async(full_text, transcription_path)
+                # Only complete transcripts are worth serving again; error placeholders don't count
+                transcribed_chunks = sum(1 for t in successful_transcriptions if not t.get('error'))
+                cacheable = (
+                    bool(created_files)
+                    and not failed_chunks
+                    and transcribed_chunks == len(created_files)
+                    and expected_chunks in (None, len(created_files))
                 )
-                loop = asyncio.get_event_loop()
-                transcription_url = await loop.run_in_executor(None, generate_url_func)
+                if not cacheable:
+                    logger.warning(
+                        f"Job {job_id}: Transcript incomplete ({transcribed_chunks}/"
+                        f"{expected_chunks or len(created_files)} chunks), not caching"
+                    )
                 
                 # Create final result
                 result = TranscriptionResult(
@@ -632,7 +1253,7 @@ async def process_file_async(
                     total_duration_seconds=total_duration_processed,
                     processing_method="split_and_transcribe",
                     chunks_processed=len(successful_transcriptions),
-                    processing_time_seconds=(datetime.now() - start_time).total_seconds(),
+                    processing_time_seconds=time.monotonic() - start_time,
                     transcription_url=transcription_url,
                     webhook_delivered=None,  # Will be updated after webhook attempt
                     # Pass through parameters from request
@@ -644,6 +1265,19 @@ async def process_file_async(
         
         logger.info(f"Job {job_id}: ✅ Processing completed in {result.processing_time_seconds:.1f}s")
         
+        if owns_cache_key and cacheable:
+            await save_transcript_manifest(cache_key, {
+                "file_name": file_name,
+                "transcription_path": transcription_path,
+                "transcription_text": result.transcription_text,
+                "total_duration_seconds": result.total_duration_seconds,
+                "processing_method": result.processing_method,
+                "chunks_processed": result.chunks_processed
+            })
+        if owns_cache_key:
+            # Waiting jobs can pick up the manifest without waiting on our webhook
+            release_inflight(cache_key)
+        
         # Send webhook notification with backup support
         webhook_delivered = False
         if webhook_url:
@@ -674,8 +1308,11 @@ async def process_file_async(
             else:
                 logger.info(f"Job {job_id}: Webhook delivered successfully")
         
+        update_job(job_id, status="completed", result=result.dict())
+        
     except Exception as e:
         logger.error(f"Job {job_id}: ❌ Processing failed: {str(e)}")
+        update_job(job_id, status="failed", error=str(e))
         
         # Send error webhook with backup support
         if webhook_url:
@@ -683,7 +1320,7 @@ async def process_file_async(
                 "job_id": job_id,
                 "status": "failed",
                 "error": str(e),
-                "processing_time_seconds": (datetime.now() - start_time).total_seconds(),
+                "processing_time_seconds": time.monotonic() - start_time,
                 # Include parameters for error handling in n8n
                 "drive_file_id": request.drive_file_id,
                 "source_folder": request.source_folder,
@@ -700,14 +1337,19 @@ async def process_file_async(
             
             if not webhook_success:
                 logger.error(f"Job {job_id}: Failed to deliver error webhook notification via all methods")
+    finally:
+        if owns_cache_key:
+            release_inflight(cache_key)
 
 async def process_chunk_with_transcription(
     chunk_index: int,
     chunk_path: str,
     job_id: str,
-    chunk_duration: float,
-    total_duration: float,
-    api_key: str
+    chunk_start: float,
+    chunk_length: float,
+    api_key: str,
+    chunk_size_bytes: int,
+    upload_semaphore: asyncio.Semaphore
 ) -> Dict:
     """Process a single chunk: upload to GCS and transcribe"""
     chunk_filename = os.path.basename(chunk_path)
@@ -716,19 +1358,17 @@ async def process_chunk_with_transcription(
     logger.info(f"Job {job_id}, Chunk {chunk_number}: Starting processing")
     
     try:
-        # Upload to GCS
+        # Upload to GCS (bounded so large jobs don't open one connection per chunk)
         gcs_chunk_path = f"{GCS_CHUNK_PREFIX}{job_id}/{chunk_filename}"
-        signed_url = await upload_to_gcs_async(chunk_path, gcs_chunk_path)
-        
-        # Get chunk info
-        chunk_stat = os.stat(chunk_path)
-        actual_duration = min(chunk_duration, total_duration - (chunk_index * chunk_duration))
+        signed_url = await run_bounded(upload_semaphore, upload_to_gcs_async(chunk_path, gcs_chunk_path))
         
+        # Get chunk info (timings come from the actual split, not the target duration)
         chunk_info = {
             "chunk_number": chunk_number,
             "filename": chunk_filename,
-            "size_mb": chunk_stat.st_size / (1024 * 1024),
-            "duration_seconds": actual_duration,
+            "size_mb": chunk_size_bytes / (1024 * 1024),
+            "start_seconds": chunk_start,
+            "duration_seconds": chunk_length,
             "gcs_path": f"gs://{GCS_BUCKET_NAME}/{gcs_chunk_path}",
             "download_url": signed_url
         }
@@ -736,7 +1376,7 @@ async def process_chunk_with_transcription(
         logger.info(f"Job {job_id}, Chunk {chunk_number}: Uploaded to GCS, starting transcription")
         
         # Transcribe immediately
-        transcription = await transcribe_single_chunk_direct(chunk_path, chunk_number, actual_duration, api_key)
+        transcription = await transcribe_single_chunk_direct(chunk_path, chunk_number, chunk_length, api_key)
         
         logger.info(f"Job {job_id}, Chunk {chunk_number}: ✅ Processing complete")
         
@@ -756,47 +1396,49 @@ async def process_chunk_with_transcription(
 async def transcribe_single_chunk_direct(file_path: str, chunk_number: int, duration: float, api_key: str) -> Dict:
     """Transcribe a chunk directly from file path"""
     logger.info(f"Transcribing chunk {chunk_number} directly from file")
-    start_time = datetime.now()
+    start_time = time.monotonic()
     
-    async with aiohttp.ClientSession() as session:
-        with open(file_path, 'rb') as audio_file:
-            audio_data = audio_file.read()
-            filename = os.path.basename(file_path)
-            
-            # Determine content type
-            file_ext = os.path.splitext(filename.lower())[1]
-            content_type = 'audio/mp4' if file_ext == '.m4a' else 'audio/mpeg'
-            
-            # Create form data
-            data = aiohttp.FormData()
-            data.add_field('file', audio_data, filename=filename, content_type=content_type)
-            data.add_field('model', 'whisper-1')
-            
-            logger.info(f"Chunk {chunk_number}: Sending {len(audio_data)/(1024*1024):.1f}MB to OpenAI")
-            
-            async with session.post(
-                'https://api.openai.com/v1/audio/transcriptions',
-                headers={"Authorization": f"Bearer {api_key}"},
-                data=data
-            ) as resp:
-                response_time = (datetime.now() - start_time).total_seconds()
-                
-                if resp.status == 200:
-                    result = await resp.json()
-                    logger.info(f"Chunk {chunk_number}: ✅ Transcribed in {response_time:.1f}s. Length: {len(result['text'])} chars")
-                    return {
-                        "chunk_number": chunk_number,
-                        "text": result['text'],
-                        "duration": duration
-                    }
-                else:
-                    error_text = await resp.text()
-                    logger.error(f"Chunk {chunk_number}: ❌ Transcription failed: {resp.status} - {error_text}")
-                    return {
-                        "chunk_number": chunk_number,
-                        "text": f"[Error {resp.status}: {error_text[:100]}]",
-                        "duration": duration
-                    }
+    session = get_http_session()
+    file_size_bytes = os.stat(file_path).st_size
+    filename = os.path.basename(file_path)
+    
+    content_type = get_audio_content_type(filename)
+    
+    logger.info(f"Chunk {chunk_number}: Streaming {file_size_bytes/(1024*1024):.1f}MB to OpenAI")
+    
+    async def send_once():
+        # Streamed from disk with chunked encoding; rebuilt per attempt
+        data = aiohttp.FormData()
+        data.add_field('file', file_sender(file_path), filename=filename, content_type=content_type)
+        data.add_field('model', 'whisper-1')
+        
+        async with session.post(
+            OPENAI_TRANSCRIPTIONS_URL,
+            headers={"Authorization": f"Bearer {api_key}"},
+            data=data
+        ) as resp:
+            if resp.status == 200:
+                return resp.status, await resp.json(loads=orjson.loads), None
+            return resp.status, await resp.text(), resp.headers.get("Retry-After")
+    
+    status, body = await post_transcription_with_retry(send_once, f"Chunk {chunk_number}")
+    response_time = time.monotonic() - start_time
+    
+    if status == 200:
+        logger.info(f"Chunk {chunk_number}: ✅ Transcribed in {response_time:.1f}s. Length: {len(body['text'])} chars")
+        return {
+            "chunk_number": chunk_number,
+            "text": body['text'],
+            "duration": duration
+        }
+    else:
+        logger.error(f"Chunk {chunk_number}: ❌ Transcription failed: {status} - {body}")
+        return {
+            "chunk_number": chunk_number,
+            "text": f"[Error {status}: {body[:100]}]",
+            "duration": duration,
+            "error": True
+        }
 
 @app.get("/")
 async def root():
@@ -879,6 +1521,211 @@ async def send_test_webhook(webhook_url: str, test_message: str = "Test webhook
         logger.error(f"Error sending test webhook: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to send test webhook: {str(e)}")
 
+def get_request_file_id(request: DriveFileRequest) -> str:
+    """Resolve the Drive file ID from either the ID or the shareable link"""
+    if request.drive_file_url:
+        return extract_file_id_from_url(request.drive_file_url)
+    elif request.drive_file_id:
+        return request.drive_file_id
+    else:
+        raise HTTPException(status_code=400, detail="Either drive_file_id or drive_file_url must be provided")
+
+def generate_job_id(file_id: str) -> str:
+    """Timestamped job ID with a random suffix, unique even for repeat submissions within a second"""
+    return f"{time.strftime('%Y%m%d%H%M%S')}_{file_id[:8]}_{os.urandom(3).hex()}"
+
+async def prepare_drive_job(
+    job_id: str,
+    file_id: str,
+    request: DriveFileRequest,
+    temp_dir: str,
+    file_metadata: Optional[Dict] = None
+):
+    """
+    Fetch the Drive file (or probe it for a streaming split) and estimate the work.
+    Files whose md5Checksum has a cached transcript, or is already being processed,
+    are not fetched at all. Pass file_metadata when the caller already has it
+    (e.g. from a folder listing) to skip the metadata request.
+    Returns the JobStatusResponse and the keyword arguments for process_file_async.
+    """
+    if file_metadata is None:
+        file_metadata = await get_drive_file_metadata_async(file_id)
+    file_name = file_metadata['name']
+    if file_metadata['mimeType'].startswith(GOOGLE_APPS_MIME_PREFIX):
+        raise HTTPException(status_code=400, detail=f"{file_name} is a Google Workspace document, not an audio file")
+    file_size_bytes = int(file_metadata['size'])
+    file_size_mb = file_size_bytes / (1024 * 1024)
+    temp_input = os.path.join(temp_dir, "input_audio")
+    job_args = {
+        "job_id": job_id,
+        "file_name": file_name,
+        "file_size_bytes": file_size_bytes,
+        "temp_input_path": None,
+        "request": request,
+        "webhook_url": request.webhook_url
+    }
+    
+    # Re-submissions of an already transcribed (or in-progress) file skip the download
+    if file_metadata.get('md5Checksum'):
+        cache_key = get_transcript_cache_key(file_metadata['md5Checksum'], request)
+        job_args["cache_key"] = cache_key
+        
+        cached_manifest = await load_transcript_manifest(cache_key)
+        wait_for = None if cached_manifest else claim_inflight(cache_key)
+        if cached_manifest or wait_for:
+            logger.info(f"Job {job_id}: {file_name} matches {'a cached' if cached_manifest else 'an in-flight'} transcription")
+            job_args["cached_manifest"] = cached_manifest
+            job_args["wait_for"] = wait_for
+            response = JobStatusResponse(
+                job_id=job_id,
+                status="processing",
+                file_name=file_name,
+                file_size_mb=file_size_mb,
+                processing_method="cached",
+                estimated_chunks=cached_manifest['chunks_processed'] if cached_manifest else None,
+                estimated_processing_time_seconds=0 if cached_manifest else None,
+                message=(
+                    "File was already transcribed - returning cached transcription" if cached_manifest
+                    else "File is already being processed - its result will be shared"
+                )
+            )
+            return response, job_args
+    
+    try:
+        response = await fetch_and_estimate(job_id, file_id, request, file_metadata, temp_input, job_args)
+    except Exception:
+        if "cache_key" in job_args:
+            release_inflight(job_args["cache_key"])
+        raise
+    return response, job_args
+
+async def fetch_and_estimate(
+    job_id: str,
+    file_id: str,
+    request: DriveFileRequest,
+    file_metadata: Dict,
+    temp_input: str,
+    job_args: Dict
+) -> JobStatusResponse:
+    """Download (or probe) the Drive file, fill in job_args and estimate the work"""
+    file_name = job_args["file_name"]
+    file_size_bytes = job_args["file_size_bytes"]
+    file_size_mb = file_size_bytes / (1024 * 1024)
+    
+    # Determine processing method and estimates
+    will_split = needs_splitting(temp_input, file_size_bytes, file_name)
+    
+    audio_info = None
+    if will_split and can_pipe_split(file_name):
+        # Probe the head only; the body is piped into ffmpeg in the background
+        logger.info(f"Job {job_id}: Probing {file_name} ({file_size_mb:.1f}MB) for streaming split")
+        try:
+            audio_info = await probe_drive_audio(file_id, file_size_bytes)
+            job_args["pipe_file_id"] = file_id
+            job_args["audio_info"] = audio_info
+        except ValueError as e:
+            # e.g. large ID3 artwork or a trailing moov atom: fall back to a full download
+            logger.warning(f"Job {job_id}: Probe of {file_name} failed ({str(e)}); downloading instead")
+    
+    if audio_info is None:
+        logger.info(f"Job {job_id}: Downloading file {file_id} from Google Drive")
+        await download_from_drive_stream(file_id, temp_input, file_metadata)
+        logger.info(f"Job {job_id}: Downloaded {file_name} ({file_size_mb:.1f}MB)")
+        job_args["temp_input_path"] = temp_input
+    
+    if not will_split:
+        # Direct transcription
+        processing_method = "direct_transcription"
+        estimated_chunks = 1
+        # Estimate ~2-3 seconds per MB for direct transcription
+        estimated_time = int(file_size_mb * 2.5)
+        message = f"File is {file_size_mb:.1f}MB and compatible - will transcribe directly"
+    else:
+        # Split and transcribe
+        processing_method = "split_and_transcribe"
+        
+        # Quick analysis for estimates
+        duration, bitrate, _ = audio_info or await get_audio_info_async(temp_input)
+        
+        # Calculate estimated chunks
+        output_bitrate = QUALITY_BITRATES_KBPS.get(request.quality, 96)
+        chunk_duration = calculate_chunk_duration(bitrate, request.max_size_mb, "m4a", output_bitrate)
+        estimated_chunks = max(1, int(duration / chunk_duration) + 1)
+        
+        # Estimate processing time: ~3s per chunk for split+transcribe
+        estimated_time = int(estimated_chunks * 3 + duration * 0.1) 
+        message = f"File is {file_size_mb:.1f}MB - will split into ~{estimated_chunks} chunks and transcribe"
+    
+    return JobStatusResponse(
+        job_id=job_id,
+        status="processing",
+        file_name=file_name,
+        file_size_mb=file_size_mb,
+        processing_method=processing_method,
+        estimated_chunks=estimated_chunks,
+        estimated_processing_time_seconds=estimated_time,
+        message=message
+    )
+
+def create_job(job_id: str, file_id: str, status: str) -> Dict:
+    """Register a job in the in-memory status store, dropping expired finished jobs"""
+    now = time.time()
+    for expired_id in [
+        known_id for known_id, job in JOBS.items()
+        if job["status"] in ("completed", "failed") and now - job["updated_at"] > JOB_RETENTION_SECONDS
+    ]:
+        del JOBS[expired_id]
+    
+    JOBS[job_id] = {"job_id": job_id, "drive_file_id": file_id, "status": status, "created_at": now, "updated_at": now}
+    return JOBS[job_id]
+
+def update_job(job_id: str, **fields):
+    """Merge fields into a tracked job's status"""
+    job = JOBS.get(job_id)
+    if job is not None:
+        job.update(fields, updated_at=time.time())
+
+async def run_drive_job(job_id: str, file_id: str, request: DriveFileRequest):
+    """Run a queued job end to end: fetch from Drive, then split/transcribe and notify"""
+    temp_dir = tempfile.mkdtemp(prefix=f"drive_split_{job_id}_")
+    try:
+        response, job_args = await prepare_drive_job(job_id, file_id, request, temp_dir)
+    except Exception as e:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        error = e.detail if isinstance(e, HTTPException) else str(e)
+        logger.error(f"Job {job_id}: Error starting processing: {error}")
+        update_job(job_id, status="failed", error=error)
+        return
+    
+    update_job(job_id, **response.dict())
+    await process_file_async(**job_args)
+
+@app.post("/jobs")
+async def submit_job(request: DriveFileRequest):
+    """
+    Queue a Drive file for processing and return immediately.
+    Poll GET /jobs/{job_id} for progress; the webhook still fires on completion.
+    """
+    file_id = get_request_file_id(request)
+    job_id = generate_job_id(file_id)
+    
+    create_job(job_id, file_id, "queued")
+    task = asyncio.create_task(run_drive_job(job_id, file_id, request))
+    # Hold a reference until the task finishes so it isn't garbage collected
+    JOB_TASKS.add(task)
+    task.add_done_callback(JOB_TASKS.discard)
+    
+    logger.info(f"Job {job_id}: Queued Drive file {file_id}")
+    return {"job_id": job_id, "status": "queued"}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Current status of a job, including the result once it has completed"""
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
 @app.post("/process-drive-file", response_model=JobStatusResponse)
 async def process_drive_file(
     request: DriveFileRequest,
@@ -890,94 +1737,39 @@ async def process_drive_file(
     2. Return immediate status with estimates 
     3. Process in background (split/transcribe as needed)
     4. Send webhook when complete
-    """
-    start_time = datetime.now()
     
-    # Extract file ID
-    if request.drive_file_url:
-        file_id = extract_file_id_from_url(request.drive_file_url)
-    elif request.drive_file_id:
-        file_id = request.drive_file_id
-    else:
-        raise HTTPException(status_code=400, detail="Either drive_file_id or drive_file_url must be provided")
-    
-    job_id = f"{start_time.strftime('%Y%m%d%H%M%S')}_{file_id[:8]}"
+    Use POST /jobs to return before the download as well.
+    """
+    return await start_drive_job(request, background_tasks)
+
+async def start_drive_job(
+    request: DriveFileRequest,
+    background_tasks: BackgroundTasks,
+    file_metadata: Optional[Dict] = None
+) -> JobStatusResponse:
+    """Fetch and analyze a Drive file, then hand its processing to a background task"""
+    file_id = get_request_file_id(request)
+    job_id = generate_job_id(file_id)
     
     # Create persistent temp directory for background processing
     temp_dir = tempfile.mkdtemp(prefix=f"drive_split_{job_id}_")
     
     try:
-        # Download from Drive
-        logger.info(f"Job {job_id}: Downloading file {file_id} from Google Drive")
-        temp_input = os.path.join(temp_dir, "input_audio")
-        file_metadata = await download_from_drive_stream(file_id, temp_input)
-        
-        file_name = file_metadata['name']
-        file_size_bytes = int(file_metadata['size'])
-        file_size_mb = file_size_bytes / (1024 * 1024)
-        
-        logger.info(f"Job {job_id}: Downloaded {file_name} ({file_size_mb:.1f}MB)")
+        response, job_args = await prepare_drive_job(job_id, file_id, request, temp_dir, file_metadata)
         
-        # Determine processing method and estimates
-        will_split = needs_splitting(temp_input, file_size_bytes, file_name)
-        
-        if not will_split:
-            # Direct transcription
-            processing_method = "direct_transcription"
-            estimated_chunks = 1
-            # Estimate ~2-3 seconds per MB for direct transcription
-            estimated_time = int(file_size_mb * 2.5)
-            message = f"File is {file_size_mb:.1f}MB and compatible - will transcribe directly"
-        else:
-            # Split and transcribe
-            processing_method = "split_and_transcribe"
-            
-            # Quick analysis for estimates
-            duration, bitrate, _ = get_audio_info(temp_input)
-            
-            # Calculate estimated chunks
-            quality_bitrates = {'high': 128, 'medium': 96, 'low': 64}
-            output_bitrate = quality_bitrates.get(request.quality, 96)
-            chunk_duration = calculate_chunk_duration(bitrate, request.max_size_mb, "m4a", output_bitrate)
-            estimated_chunks = max(1, int(duration / chunk_duration) + 1)
-            
-            # Estimate processing time: ~3s per chunk for split+transcribe
-            estimated_time = int(estimated_chunks * 3 + duration * 0.1) 
-            message = f"File is {file_size_mb:.1f}MB - will split into ~{estimated_chunks} chunks and transcribe"
+        # Track the job so it can be polled via GET /jobs/{job_id}
+        create_job(job_id, file_id, "processing")
+        update_job(job_id, **response.dict())
         
         # Start background processing
-        background_tasks.add_task(
-            process_file_async,
-            job_id,
-            file_name,
-            file_size_bytes,
-            temp_input,
-            request,
-            request.webhook_url
-        )
+        background_tasks.add_task(process_file_async, **job_args)
         
-        # Return immediate status
-        response = JobStatusResponse(
-            job_id=job_id,
-            status="processing",
-            file_name=file_name,
-            file_size_mb=file_size_mb,
-            processing_method=processing_method,
-            estimated_chunks=estimated_chunks,
-            estimated_processing_time_seconds=estimated_time,
-            message=message
-        )
-        
-        logger.info(f"Job {job_id}: Started background processing - {processing_method}")
+        logger.info(f"Job {job_id}: Started background processing - {response.processing_method}")
         return response
         
     except Exception as e:
         # Clean up temp directory on error
-        import shutil
-        try:
-            shutil.rmtree(temp_dir)
-        except:
-            pass
+        shutil.rmtree(temp_dir, ignore_errors=True)
         
         logger.error(f"Job {job_id}: Error starting processing: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
@@ -991,8 +1783,8 @@ async def transcribe_and_compile(
     Transcribe chunks and compile into minutes
     This can be called after splitting or with existing chunks
     """
-    start_time = datetime.now()
-    job_id = f"transcript_{start_time.strftime('%Y%m%d%H%M%S')}"
+    start_time = time.monotonic()
+    job_id = f"transcript_{datetime.now().strftime('%Y%m%d%H%M%S')}"
     
     # Get API key
     api_key = request.openai_api_key or os.environ.get("OPENAI_API_KEY")
@@ -1004,30 +1796,20 @@ async def transcribe_and_compile(
         logger.info(f"Transcribing {len(request.chunks)} chunks in parallel")
         transcriptions = await transcribe_chunks_parallel(request.chunks, api_key)
         
-        # Combine transcriptions
-        full_text = "\n\n".join([t['text'] for t in sorted(transcriptions, key=lambda x: x['chunk_number'])])
+        # Combine transcriptions in chunk order and stream them to GCS
+        texts = collect_in_order(transcriptions)
         total_duration = sum(t['duration'] for t in transcriptions)
         
         # Save transcription
         transcription_path = f"transcriptions/{job_id}/full_transcript.txt"
-        transcription_blob = bucket.blob(transcription_path)
-        transcription_blob.upload_from_string(full_text)
-        # Generate signed URL with proper async handling
-        generate_url_func = partial(
-            transcription_blob.generate_signed_url,
-            version="v4",
-            expiration=timedelta(hours=SIGNED_URL_EXPIRY_HOURS),
-            method="GET"
-        )
-        loop = asyncio.get_event_loop()
-        transcription_url = await loop.run_in_executor(None, generate_url_func)
+        transcription_url = await upload_text_parts_to_gcs_async(texts, transcription_path)
         
         response = {
             "job_id": job_id,
             "status": "transcribed",
             "total_duration_seconds": total_duration,
             "transcription_url": transcription_url,
-            "processing_time_seconds": (datetime.now() - start_time).total_seconds()
+            "processing_time_seconds": time.monotonic() - start_time
         }
         
         # Compile minutes if requested
@@ -1047,9 +1829,30 @@ async def transcribe_and_compile(
         logger.error(f"Transcription error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
 
+def list_drive_folder_audio(folder_id: str) -> List[Dict]:
+    """List every audio file in a Drive folder, following pageToken across result pages"""
+    query = f"'{folder_id}' in parents and mimeType contains 'audio/'"
+    files = []
+    page_token = None
+    while True:
+        results = drive_service.files().list(
+            q=query,
+            # size and md5Checksum let each file's job skip its own metadata request
+            fields="nextPageToken, files(id, name, mimeType, size, md5Checksum)",
+            pageSize=1000,
+            pageToken=page_token,
+            supportsAllDrives=True,
+            includeItemsFromAllDrives=True
+        ).execute(http=get_drive_http(), num_retries=DRIVE_MAX_RETRIES)
+        files.extend(results.get('files', []))
+        page_token = results.get('nextPageToken')
+        if not page_token:
+            return files
+
 @app.post("/process-drive-folder")
 async def process_drive_folder(
     folder_id: str,
+    background_tasks: BackgroundTasks,
     max_size_mb: float = 20,
     output_format: str = "auto",
     quality: str = "medium",
@@ -1064,20 +1867,14 @@ async def process_drive_folder(
     
     try:
         # List files in folder (with shared drive support)
-        query = f"'{folder_id}' in parents and mimeType contains 'audio/'"
-        results = drive_service.files().list(
-            q=query,
-            fields="files(id, name, mimeType)",
-            supportsAllDrives=True,
-            includeItemsFromAllDrives=True
-        ).execute()
-        
-        files = results.get('files', [])
+        loop = asyncio.get_event_loop()
+        files = await loop.run_in_executor(None, list_drive_folder_audio, folder_id)
         logger.info(f"Found {len(files)} audio files in folder")
         
-        # Process each file
-        jobs = []
-        for file in files:
+        # Start files concurrently, bounded so temp dirs don't pile up
+        semaphore = asyncio.Semaphore(FOLDER_CONCURRENCY)
+        
+        async def start_file(file: Dict):
             request = DriveFileRequest(
                 drive_file_id=file['id'],
                 max_size_mb=max_size_mb,
@@ -1085,9 +1882,20 @@ async def process_drive_folder(
                 quality=quality,
                 webhook_url=webhook_url
             )
-            
-            job = await process_drive_file(request, BackgroundTasks())
-            jobs.append(job)
+            async with semaphore:
+                return await start_drive_job(request, background_tasks, file_metadata=file if 'size' in file else None)
+        
+        results = await asyncio.gather(*(start_file(file) for file in files), return_exceptions=True)
+        
+        # A failing file is reported in place instead of failing the whole folder
+        jobs = []
+        for file, result in zip(files, results):
+            if isinstance(result, Exception):
+                error = result.detail if isinstance(result, HTTPException) else str(result)
+                logger.error(f"Folder file {file['id']} failed to start: {error}")
+                jobs.append({"file_id": file['id'], "file_name": file.get('name'), "error": error})
+            else:
+                jobs.append(result)
         
         return {
             "folder_id": folder_id,
@@ -1101,10 +1909,6 @@ async def process_drive_folder(
 
 async def send_webhook(webhook_url: str, data: dict, max_retries: int = 3, timeout: int = 30, test_connectivity: bool = True):
     """Send webhook notification with retry logic and comprehensive logging"""
-    import time
-    import json
-    from urllib.parse import urlparse
-    
     # Validate webhook URL
     try:
         parsed_url = urlparse(webhook_url)
@@ -1117,7 +1921,9 @@ async def send_webhook(webhook_url: str, data: dict, max_retries: int = 3, timeo
     
     logger.info(f"Sending webhook to: {webhook_url}")
     logger.info(f"Webhook payload keys: {list(data.keys())}")
-    logger.info(f"Webhook payload size: {len(json.dumps(data))} bytes")
+    # Serialize once: the same body is logged and reused by every attempt
+    payload = orjson.dumps(data)
+    logger.info(f"Webhook payload size: {len(payload)} bytes")
     
     # Test connectivity first if requested
     if test_connectivity:
@@ -1143,54 +1949,55 @@ async def send_webhook(webhook_url: str, data: dict, max_retries: int = 3, timeo
     timeout_config = aiohttp.ClientTimeout(total=timeout, connect=10, sock_read=10)
     
     for attempt in range(max_retries):
-        start_time = time.time()
+        start_time = time.monotonic()
         
         try:
-            async with aiohttp.ClientSession(timeout=timeout_config) as session:
-                # Add custom headers for better debugging
-                headers = {
-                    'Content-Type': 'application/json',
-                    'User-Agent': 'AudioSplitter-CloudRun/3.0.0',
-                    'X-Webhook-Attempt': str(attempt + 1),
-                    'X-Webhook-Max-Retries': str(max_retries)
-                }
+            session = get_http_session()
+            # Add custom headers for better debugging
+            headers = {
+                'Content-Type': 'application/json',
+                'User-Agent': 'AudioSplitter-CloudRun/3.0.0',
+                'X-Webhook-Attempt': str(attempt + 1),
+                'X-Webhook-Max-Retries': str(max_retries)
+            }
+            
+            logger.info(f"Webhook attempt {attempt + 1}/{max_retries} to {webhook_url}")
+            
+            async with session.post(
+                webhook_url, 
+                data=payload, 
+                headers=headers,
+                timeout=timeout_config,
+                allow_redirects=False  # Don't follow redirects to better debug URL issues
+            ) as response:
+                response_time = time.monotonic() - start_time
+                response_text = await response.text()
                 
-                logger.info(f"Webhook attempt {attempt + 1}/{max_retries} to {webhook_url}")
+                logger.info(f"Webhook response: {response.status} in {response_time:.2f}s")
+                logger.info(f"Response headers: {dict(response.headers)}")
                 
-                async with session.post(
-                    webhook_url, 
-                    json=data, 
-                    headers=headers,
-                    allow_redirects=False  # Don't follow redirects to better debug URL issues
-                ) as response:
-                    response_time = time.time() - start_time
-                    response_text = await response.text()
+                if response.status == 200:
+                    logger.info(f"✅ Webhook delivered successfully to {webhook_url} (attempt {attempt + 1})")
+                    if response_text:
+                        logger.info(f"Response body: {response_text[:200]}..." if len(response_text) > 200 else f"Response body: {response_text}")
+                    return True
+                elif response.status == 404:
+                    logger.error(f"❌ Webhook URL not found (404): {webhook_url}")
+                    logger.error(f"This usually means the n8n resume URL has expired or is invalid")
+                    logger.error(f"Response body: {response_text[:500]}..." if len(response_text) > 500 else f"Response body: {response_text}")
                     
-                    logger.info(f"Webhook response: {response.status} in {response_time:.2f}s")
-                    logger.info(f"Response headers: {dict(response.headers)}")
+                    # For 404 errors, don't retry immediately - the URL is likely expired
+                    if attempt < max_retries - 1:
+                        logger.info(f"Will retry webhook in case of temporary n8n issue")
+                elif response.status >= 500:
+                    logger.warning(f"Server error {response.status}, will retry. Response: {response_text[:200]}..." if len(response_text) > 200 else f"Server error {response.status}, will retry. Response: {response_text}")
+                elif response.status in [301, 302, 303, 307, 308]:
+                    redirect_location = response.headers.get('Location', 'Not provided')
+                    logger.error(f"Webhook URL redirected ({response.status}) to: {redirect_location}")
+                    logger.error(f"Original URL: {webhook_url}")
+                else:
+                    logger.error(f"Webhook failed with status {response.status}: {response_text[:200]}..." if len(response_text) > 200 else f"Webhook failed with status {response.status}: {response_text}")
                     
-                    if response.status == 200:
-                        logger.info(f"✅ Webhook delivered successfully to {webhook_url} (attempt {attempt + 1})")
-                        if response_text:
-                            logger.info(f"Response body: {response_text[:200]}..." if len(response_text) > 200 else f"Response body: {response_text}")
-                        return True
-                    elif response.status == 404:
-                        logger.error(f"❌ Webhook URL not found (404): {webhook_url}")
-                        logger.error(f"This usually means the n8n resume URL has expired or is invalid")
-                        logger.error(f"Response body: {response_text[:500]}..." if len(response_text) > 500 else f"Response body: {response_text}")
-                        
-                        # For 404 errors, don't retry immediately - the URL is likely expired
-                        if attempt < max_retries - 1:
-                            logger.info(f"Will retry webhook in case of temporary n8n issue")
-                    elif response.status >= 500:
-                        logger.warning(f"Server error {response.status}, will retry. Response: {response_text[:200]}..." if len(response_text) > 200 else f"Server error {response.status}, will retry. Response: {response_text}")
-                    elif response.status in [301, 302, 303, 307, 308]:
-                        redirect_location = response.headers.get('Location', 'Not provided')
-                        logger.error(f"Webhook URL redirected ({response.status}) to: {redirect_location}")
-                        logger.error(f"Original URL: {webhook_url}")
-                    else:
-                        logger.error(f"Webhook failed with status {response.status}: {response_text[:200]}..." if len(response_text) > 200 else f"Webhook failed with status {response.status}: {response_text}")
-                        
         except asyncio.TimeoutError:
             logger.error(f"Webhook timeout after {timeout}s (attempt {attempt + 1})")
         except aiohttp.ClientConnectorError as e:
@@ -1215,6 +2022,7 @@ async def send_webhook(webhook_url: str, data: dict, max_retries: int = 3, timeo
 async def startup_event():
     """Initialize the application"""
     logger.info("Audio Splitter Drive API started")
+    get_http_session()
     if drive_service:
         logger.info("Google Drive integration enabled")
     else:
@@ -1224,7 +2032,12 @@ async def startup_event():
 async def shutdown_event():
     """Clean up on shutdown"""
     logger.info("Shutting down Audio Splitter Drive API")
-    executor.shutdown(wait=True)
+    session = getattr(app.state, "http_session", None)
+    if session is not None:
+        await session.close()
+    GCS_POOL.shutdown(wait=True)
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8080)
\ No newline at end of file
+    # Single worker: JOBS and INFLIGHT_JOBS live in process memory, so extra workers
+    # would miss each other's jobs. uvloop/httptools come with uvicorn[standard].
+    uvicorn.run(app, host="0.0.0.0", port=8080, loop="uvloop", http="httptools")
\ No newline at end of file
@@ -24,11 +24,64 @@ from pathlib import Path
 import logging
 from datetime import datetime
 import json
+import csv
+import asyncio
+import tempfile
+
+try:
+    from mutagen import File as MutagenFile
+except ImportError:
+    MutagenFile = None
+
+# mutagen file types -> ffprobe codec names used by the format/stream-copy tables
+MUTAGEN_CODECS = {
+    'MP3': 'mp3',
+    'OggOpus': 'opus',
+    'OggVorbis': 'vorbis',
+    'FLAC': 'flac',
+    'ASF': 'wmav2',
+}
+
+def read_audio_header(filepath):
+    """
+    Read duration, bitrate and codec from the container header in-process with mutagen.
+    Returns None when mutagen is unavailable or doesn't recognise the file.
+    """
+    if MutagenFile is None:
+        return None
+    
+    try:
+        audio = MutagenFile(filepath)
+    except Exception:
+        return None
+    if audio is None or not getattr(audio.info, 'length', 0):
+        return None
+    
+    kind = type(audio).__name__
+    if kind == 'MP4':
+        codec_name = 'aac' if str(getattr(audio.info, 'codec', '')).startswith('mp4a') else None
+    elif kind == 'WAVE':
+        codec_name = f"pcm_s{audio.info.bits_per_sample}le" if audio.info.bits_per_sample in (16, 24, 32) else None
+    else:
+        codec_name = MUTAGEN_CODECS.get(kind)
+    if not codec_name:
+        return None
+    
+    duration = float(audio.info.length)
+    # Overall bitrate, like ffprobe's format bit_rate
+    bitrate = os.path.getsize(filepath) * 8 / duration
+    return duration, bitrate, codec_name
 
 def get_audio_info(filepath):
     """
-    Get duration, bitrate and codec information of the audio file using ffmpeg.probe
+    Get duration, bitrate and codec information of the audio file.
+    Reads the header with mutagen and only falls back to ffmpeg.probe
+    (a forked ffprobe) for files mutagen can't handle
     """
+    header_info = read_audio_header(filepath)
+    if header_info:
+        return header_info
+    
     probe = ffmpeg.probe(filepath)
     format_info = probe['format']
     duration = float(format_info['duration'])  # in seconds
@@ -165,6 +218,92 @@ def validate_input_file(filepath):
     
     return True
 
+# Process-wide cap on concurrent ffmpeg processes, shared by every job in the
+# service, so concurrent requests can't oversubscribe the CPUs
+FFMPEG_SEM = asyncio.Semaphore(int(os.environ.get("FFMPEG_MAX_PROCESSES", os.cpu_count() or 1)))
+
+# Quality presets (optimized for speech transcription)
+QUALITY_SETTINGS = {
+    'high': {'bitrate': '128k', 'sample_rate': '24000'},
+    'medium': {'bitrate': '96k', 'sample_rate': '16000'},
+    'low': {'bitrate': '64k', 'sample_rate': '16000'}
+}
+
+# Encoded bitrate (kbps) per quality preset, for sizing chunks before encoding
+QUALITY_BITRATES_KBPS = {quality: int(settings['bitrate'].rstrip('k')) for quality, settings in QUALITY_SETTINGS.items()}
+
+# Input codecs that can be remuxed into each output container without re-encoding
+STREAM_COPY_CODECS = {
+    'mp3': {'mp3'},
+    'm4a': {'aac'},
+    'ogg': {'opus', 'vorbis'},
+}
+
+# How often iter_audio_segments checks ffmpeg's segment list for finished chunks
+SEGMENT_POLL_SECONDS = 0.5
+
+def can_stream_copy(codec_name, output_format):
+    """
+    Check whether the input codec already matches the output format, so chunks
+    can be cut with -c:a copy instead of being decoded and re-encoded
+    """
+    return bool(codec_name) and codec_name.lower() in STREAM_COPY_CODECS.get(output_format, set())
+
+def get_codec_args(output_format, settings, stream_copy=False):
+    """
+    Return the ffmpeg audio codec arguments for the given output format.
+    With stream_copy the input packets are copied as-is (no bitrate, sample rate
+    or channel changes)
+    """
+    if stream_copy:
+        return ['-c:a', 'copy']
+    
+    if output_format == 'mp3':
+        codec_args = [
+            '-c:a', 'libmp3lame',  # MP3 codec
+            '-b:a', settings['bitrate'],  # Audio bitrate
+            '-ar', settings['sample_rate'],  # Sample rate
+        ]
+    elif output_format == 'wav':
+        codec_args = ['-c:a', 'pcm_s16le', '-ar', '44100']
+    elif output_format in ('m4a', 'mp4'):
+        codec_args = ['-c:a', 'aac', '-b:a', settings['bitrate'], '-ar', settings['sample_rate']]
+    elif output_format == 'flac':
+        codec_args = ['-c:a', 'flac', '-ar', settings['sample_rate']]
+    elif output_format == 'ogg':
+        codec_args = ['-c:a', 'libvorbis', '-b:a', settings['bitrate'], '-ar', settings['sample_rate']]
+    elif output_format == 'webm':
+        codec_args = [
+            '-c:a', 'libopus',
+            '-b:a', settings['bitrate'],
+            '-ar', '48000',  # Opus works best at 48kHz
+        ]
+    else:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    
+    return codec_args + ['-ac', '2']  # Stereo output
+
+def build_chunk_command(input_file, start_time, chunk_duration, output_path, output_format, settings, threads=None, stream_copy=False):
+    """
+    Build the ffmpeg command that extracts one chunk in the given output format
+    """
+    # -ss before -i seeks the input via the container index instead of decoding
+    # (and discarding) everything before start_time; with re-encoding ffmpeg
+    # still trims to the exact timestamp (accurate_seek is on by default)
+    cmd = [
+        'ffmpeg',
+        '-y',  # Overwrite output files
+        '-ss', str(start_time),
+        '-i', input_file,
+        '-t', str(chunk_duration),
+        '-vn',  # No video
+    ]
+    cmd += get_codec_args(output_format, settings, stream_copy)
+    if threads:
+        cmd += ['-threads', str(threads)]
+    cmd.append(output_path)
+    return cmd
+
 def split_audio(input_file, chunk_duration, output_dir, output_format='m4a', quality='medium', verbose=False, logger=None, stream_mode=False):
     """
     Use ffmpeg to split the audio file into chunks of chunk_duration seconds
@@ -181,14 +320,7 @@ def split_audio(input_file, chunk_duration, output_dir, output_format='m4a', qua
     duration, bitrate, codec_name = get_audio_info(input_file)
     num_chunks = math.ceil(duration / chunk_duration)
     
-    # Quality presets (optimized for speech transcription)
-    quality_settings = {
-        'high': {'bitrate': '128k', 'sample_rate': '24000'},
-        'medium': {'bitrate': '96k', 'sample_rate': '16000'},
-        'low': {'bitrate': '64k', 'sample_rate': '16000'}
-    }
-    
-    settings = quality_settings.get(quality, quality_settings['high'])
+    settings = QUALITY_SETTINGS.get(quality, QUALITY_SETTINGS['high'])
     
     if not logger:
         logger = logging.getLogger('audio_splitter')
@@ -198,140 +330,52 @@ def split_audio(input_file, chunk_duration, output_dir, output_format='m4a', qua
         print(f"Output format: {output_format.upper()} @ {settings['bitrate']} bitrate", file=sys.stderr)
         print(f"Creating {num_chunks} chunks of ~{chunk_duration:.1f} seconds each", file=sys.stderr)
     
-    successfully_created = []
+    logger.info(f"Splitting into ~{num_chunks} chunks with a single ffmpeg segment pass")
     
-    for i in range(num_chunks):
-        start_time = i * chunk_duration
+    def announce_chunk(i):
         output_path = os.path.join(output_dir, f'chunk_{i+1:03d}.{output_format}')
-        
         # Stream mode: emit JSON immediately for n8n
         if stream_mode:
             chunk_info = {
                 "chunk_number": i + 1,
                 "total_chunks": num_chunks,
                 "output_path": output_path,
-                "start_time": start_time,
+                "start_time": i * chunk_duration,
                 "duration": chunk_duration,
                 "status": "processing"
             }
             print(json.dumps(chunk_info), flush=True)
         else:
             # IMPORTANT: Maintain original stdout format for n8n compatibility
-            print(f"Exporting {output_path}")
-        
+            print(f"Exporting {output_path}", flush=True)
         logger.info(f"Processing chunk {i+1}/{num_chunks}: {os.path.basename(output_path)}")
-        
-        try:
-            # Build ffmpeg command based on output format
-            if output_format == 'mp3':
-                cmd = [
-                    'ffmpeg',
-                    '-y',  # Overwrite output files
-                    '-i', input_file,
-                    '-ss', str(start_time),
-                    '-t', str(chunk_duration),
-                    '-vn',  # No video
-                    '-c:a', 'libmp3lame',  # MP3 codec
-                    '-b:a', settings['bitrate'],  # Audio bitrate
-                    '-ar', settings['sample_rate'],  # Sample rate
-                    '-ac', '2',  # Stereo output
-                    output_path
-                ]
-            elif output_format == 'wav':
-                cmd = [
-                    'ffmpeg',
-                    '-y',
-                    '-i', input_file,
-                    '-ss', str(start_time),
-                    '-t', str(chunk_duration),
-                    '-vn',
-                    '-c:a', 'pcm_s16le',
-                    '-ar', '44100',
-                    '-ac', '2',
-                    output_path
-                ]
-            elif output_format == 'm4a':
-                cmd = [
-                    'ffmpeg',
-                    '-y',
-                    '-i', input_file,
-                    '-ss', str(start_time),
-                    '-t', str(chunk_duration),
-                    '-vn',
-                    '-c:a', 'aac',
-                    '-b:a', settings['bitrate'],
-                    '-ar', settings['sample_rate'],
-                    '-ac', '2',
-                    output_path
-                ]
-            elif output_format == 'flac':
-                cmd = [
-                    'ffmpeg',
-                    '-y',
-                    '-i', input_file,
-                    '-ss', str(start_time),
-                    '-t', str(chunk_duration),
-                    '-vn',
-                    '-c:a', 'flac',
-                    '-ar', settings['sample_rate'],
-                    '-ac', '2',
-                    output_path
-                ]
-            elif output_format == 'ogg':
-                cmd = [
-                    'ffmpeg',
-                    '-y',
-                    '-i', input_file,
-                    '-ss', str(start_time),
-                    '-t', str(chunk_duration),
-                    '-vn',
-                    '-c:a', 'libvorbis',
-                    '-b:a', settings['bitrate'],
-                    '-ar', settings['sample_rate'],
-                    '-ac', '2',
-                    output_path
-                ]
-            elif output_format == 'webm':
-                cmd = [
-                    'ffmpeg',
-                    '-y',
-                    '-i', input_file,
-                    '-ss', str(start_time),
-                    '-t', str(chunk_duration),
-                    '-vn',
-                    '-c:a', 'libopus',
-                    '-b:a', settings['bitrate'],
-                    '-ar', '48000',  # Opus works best at 48kHz
-                    '-ac', '2',
-                    output_path
-                ]
-            elif output_format == 'mp4':
-                cmd = [
-                    'ffmpeg',
-                    '-y',
-                    '-i', input_file,
-                    '-ss', str(start_time),
-                    '-t', str(chunk_duration),
-                    '-vn',
-                    '-c:a', 'aac',
-                    '-b:a', settings['bitrate'],
-                    '-ar', settings['sample_rate'],
-                    '-ac', '2',
-                    output_path
-                ]
-            
-            # Run ffmpeg with error capture
-            result = subprocess.run(cmd, capture_output=True, text=True)
+    
+    # One decode pass writes every chunk; ffmpeg appends each finished chunk to the
+    # segment list, which is followed so every chunk is reported as soon as it closes
+    segment_list = os.path.join(output_dir, 'segments.csv')
+    cmd = build_segment_command(input_file, chunk_duration, output_dir, output_format, settings, segment_list=segment_list)
+    successfully_created = []
+    
+    with tempfile.TemporaryFile() as stderr_file:
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=stderr_file)
+        announce_chunk(0)
+        announced = 1
+        while True:
+            try:
+                proc.wait(timeout=SEGMENT_POLL_SECONDS)
+                finished = True
+            except subprocess.TimeoutExpired:
+                finished = False
             
-            if result.returncode != 0:
-                logger.error(f"FFmpeg failed for chunk {i+1}: {result.stderr[:500]}")
-                print(f"Warning: Error processing chunk {i+1}", file=sys.stderr)
-                if verbose:
-                    print(f"FFmpeg error: {result.stderr}", file=sys.stderr)
-            else:
+            segments = read_segment_list(segment_list, output_dir)
+            for i in range(len(successfully_created), len(segments)):
+                if announced <= i:
+                    announce_chunk(i)
+                    announced = i + 1
+                output_path, start_time, segment_duration = segments[i]
+                successfully_created.append(output_path)
                 file_size = os.path.getsize(output_path) / (1024 * 1024)
                 logger.info(f"Chunk {i+1} created successfully: {os.path.basename(output_path)} ({file_size:.1f} MB)")
-                successfully_created.append(output_path)
                 
                 # Stream mode: emit success status immediately
                 if stream_mode:
@@ -339,18 +383,292 @@ def split_audio(input_file, chunk_duration, output_dir, output_format='m4a', qua
                         "chunk_number": i + 1,
                         "total_chunks": num_chunks,
                         "output_path": output_path,
+                        "start_time": round(start_time, 3),
+                        "duration": round(segment_duration, 3),
                         "file_size_mb": round(file_size, 2),
                         "status": "completed"
                     }
                     print(json.dumps(chunk_info), flush=True)
-                
-        except Exception as e:
-            logger.error(f"Exception while creating chunk {i+1}: {str(e)}")
-            print(f"Failed to create chunk {i+1}: {str(e)}", file=sys.stderr)
-            continue
+            
+            if finished:
+                break
+            # The chunk ffmpeg is writing now
+            if announced == len(successfully_created) and announced < num_chunks:
+                announce_chunk(announced)
+                announced += 1
+        
+        if proc.returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors='replace')
+            logger.error(f"FFmpeg segment split failed: {stderr[-500:]}")
+            print("Warning: Error while splitting audio", file=sys.stderr)
+            if verbose:
+                print(f"FFmpeg error: {stderr}", file=sys.stderr)
     
     return successfully_created
 
+async def split_audio_parallel(input_file, chunk_duration, output_dir, output_format='m4a', quality='medium', logger=None, duration=None, max_parallel=None, stream_copy=False):
+    """
+    Split the audio file by running one ffmpeg process per time range concurrently.
+    Decoding is the CPU-bound hot path, so independent ranges are spread across cores.
+    
+    Args:
+        input_file: Path to input audio file
+        chunk_duration: Duration of each chunk in seconds
+        output_dir: Directory to save output chunks
+        output_format: Output format (default: m4a for OpenAI compatibility)
+        quality: Audio quality setting ('high', 'medium', 'low')
+        duration: Known input duration in seconds (probed if not given)
+        max_parallel: Per-call cap on concurrent ffmpeg processes (FFMPEG_SEM always applies)
+        stream_copy: Copy the input codec instead of re-encoding (see can_stream_copy)
+    
+    Returns (path, start_seconds, duration_seconds) for each created chunk, in chunk order.
+    Re-encoded ranges are cut exactly, so the durations follow from the requested ranges.
+    Raises RuntimeError if any range fails; the remaining ffmpeg processes are stopped.
+    """
+    if not logger:
+        logger = logging.getLogger('audio_splitter')
+    
+    if duration is None:
+        duration, _, _ = await asyncio.to_thread(get_audio_info, input_file)
+    num_chunks = math.ceil(duration / chunk_duration)
+    settings = QUALITY_SETTINGS.get(quality, QUALITY_SETTINGS['high'])
+    semaphore = asyncio.Semaphore(max_parallel or num_chunks or 1)
+    
+    async def run_range(i):
+        start_time = i * chunk_duration
+        output_path = os.path.join(output_dir, f'chunk_{i+1:03d}.{output_format}')
+        cmd = build_chunk_command(input_file, start_time, chunk_duration, output_path, output_format, settings, threads=2, stream_copy=stream_copy)
+        
+        async with semaphore, FFMPEG_SEM:
+            logger.info(f"Processing chunk {i+1}/{num_chunks}: {os.path.basename(output_path)}")
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                _, stderr = await proc.communicate()
+            except asyncio.CancelledError:
+                # Another range failed; don't leave this ffmpeg running behind it
+                proc.kill()
+                await proc.wait()
+                raise
+        
+        if proc.returncode != 0:
+            raise RuntimeError(f"FFmpeg failed for chunk {i+1}: {stderr.decode(errors='replace')[-500:]}")
+        
+        logger.info(f"Chunk {i+1} created successfully: {os.path.basename(output_path)}")
+        return output_path, start_time, min(chunk_duration, duration - start_time)
+    
+    # A missing range would leave a silent gap in the transcript, so the first
+    # failure fails the whole split
+    tasks = [asyncio.create_task(run_range(i)) for i in range(num_chunks)]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+def build_segment_command(input_source, chunk_duration, output_dir, output_format, settings, stream_copy=False, segment_list=None):
+    """
+    Build an ffmpeg command that writes every chunk in one pass with the segment muxer.
+    input_source may be a path or 'pipe:0' to read the audio from stdin.
+    Chunks are named chunk_001.<format>, chunk_002.<format>, ...
+    With segment_list, ffmpeg also writes a CSV of each chunk's actual start and end time.
+    """
+    output_pattern = os.path.join(output_dir, f'chunk_%03d.{output_format}')
+    cmd = [
+        'ffmpeg',
+        '-y',
+        '-i', input_source,
+        '-vn',
+    ]
+    cmd += get_codec_args(output_format, settings, stream_copy)
+    cmd += [
+        '-f', 'segment',
+        '-segment_time', str(chunk_duration),
+    ]
+    if stream_copy:
+        # Copied packets can only be cut on packet boundaries; allow a little slack
+        cmd += ['-segment_time_delta', '0.05']
+    cmd += [
+        '-segment_start_number', '1',
+        '-reset_timestamps', '1',
+    ]
+    if segment_list:
+        cmd += ['-segment_list', segment_list, '-segment_list_type', 'csv']
+    cmd.append(output_pattern)
+    return cmd
+
+def read_segment_list(segment_list, output_dir):
+    """
+    Parse the CSV segment list written by ffmpeg's segment muxer.
+    Returns (path, start_seconds, duration_seconds) for each chunk, in chunk order.
+    Boundaries land on packet edges, so these differ slightly from the target duration.
+    Safe to call while ffmpeg is still writing: a trailing partial line is ignored.
+    """
+    try:
+        with open(segment_list, newline='') as fh:
+            lines = fh.read().split('\n')[:-1]
+    except FileNotFoundError:
+        # ffmpeg hasn't finished its first segment yet
+        return []
+    return [
+        (os.path.join(output_dir, name), float(start), float(end) - float(start))
+        for name, start, end in csv.reader(lines)
+    ]
+
+async def split_audio_segments(input_file, chunk_duration, output_dir, output_format='m4a', quality='medium', logger=None, stream_copy=False):
+    """
+    Split a local audio file with one ffmpeg segment pass.
+    Used for stream copies, where the work is I/O-bound and a single pass beats
+    N seeking invocations.
+    
+    Returns (path, start_seconds, duration_seconds) for each created chunk, in chunk order.
+    """
+    if not logger:
+        logger = logging.getLogger('audio_splitter')
+    
+    settings = QUALITY_SETTINGS.get(quality, QUALITY_SETTINGS['high'])
+    segment_list = os.path.join(output_dir, 'segments.csv')
+    cmd = build_segment_command(input_file, chunk_duration, output_dir, output_format, settings, stream_copy, segment_list)
+    
+    async with FFMPEG_SEM:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await proc.communicate()
+    
+    if proc.returncode != 0:
+        raise RuntimeError(f"FFmpeg segment split failed: {stderr.decode(errors='replace')[-500:]}")
+    
+    chunks = read_segment_list(segment_list, output_dir)
+    logger.info(f"Created {len(chunks)} chunks in one segment pass")
+    return chunks
+
+async def iter_audio_segments(input_file, chunk_duration, output_dir, output_format='m4a', quality='medium', logger=None, stream_copy=False):
+    """
+    Split a local audio file with one ffmpeg segment pass, like split_audio_segments,
+    but yield each chunk as soon as ffmpeg finishes it by following the segment list
+    ffmpeg appends to after every segment.
+    
+    Yields (path, start_seconds, duration_seconds) for each created chunk, in chunk order.
+    """
+    if not logger:
+        logger = logging.getLogger('audio_splitter')
+    
+    settings = QUALITY_SETTINGS.get(quality, QUALITY_SETTINGS['high'])
+    segment_list = os.path.join(output_dir, 'segments.csv')
+    cmd = build_segment_command(input_file, chunk_duration, output_dir, output_format, settings, stream_copy, segment_list)
+    
+    async with FFMPEG_SEM:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stderr_task = asyncio.create_task(proc.stderr.read())
+        wait_task = asyncio.create_task(proc.wait())
+        emitted = 0
+        
+        try:
+            while True:
+                done, _ = await asyncio.wait({wait_task}, timeout=SEGMENT_POLL_SECONDS)
+                chunks = read_segment_list(segment_list, output_dir)
+                for chunk in chunks[emitted:]:
+                    yield chunk
+                emitted = len(chunks)
+                if done:
+                    break
+        finally:
+            # The consumer may stop early; don't leave ffmpeg running behind it
+            if proc.returncode is None:
+                proc.kill()
+            await wait_task
+            stderr = await stderr_task
+    
+    if proc.returncode != 0:
+        raise RuntimeError(f"FFmpeg segment split failed: {stderr.decode(errors='replace')[-500:]}")
+    
+    logger.info(f"Created {emitted} chunks in one segment pass")
+
+async def probe_audio_bytes(data):
+    """
+    Probe the head of an audio stream with ffprobe over stdin.
+    Returns (bitrate, codec_name); bitrate is None when the header doesn't carry one.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        'ffprobe', '-v', 'error', '-print_format', 'json', '-show_format', '-show_streams', '-i', 'pipe:0',
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await proc.communicate(data)
+    probe = json.loads(stdout or b'{}')
+    
+    audio_stream = next((stream for stream in probe.get('streams', [])
+                        if stream.get('codec_type') == 'audio'), None)
+    if not audio_stream:
+        raise ValueError(f"No audio stream found in the file: {stderr.decode(errors='replace')[:200]}")
+    
+    bitrate = audio_stream.get('bit_rate') or probe.get('format', {}).get('bit_rate')
+    return (float(bitrate) if bitrate else None), audio_stream['codec_name']
+
+async def split_audio_stream(byte_chunks, chunk_duration, output_dir, output_format='m4a', quality='medium', logger=None, stream_copy=False):
+    """
+    Split audio arriving as an async iterator of byte chunks by piping it into a
+    single ffmpeg segment process, so the input never has to be written to disk.
+    The container must be readable without seeking (MP3, WAV, FLAC, OGG, ADTS AAC, WebM).
+    
+    Returns (path, start_seconds, duration_seconds) for each created chunk, in chunk order.
+    """
+    if not logger:
+        logger = logging.getLogger('audio_splitter')
+    
+    settings = QUALITY_SETTINGS.get(quality, QUALITY_SETTINGS['high'])
+    segment_list = os.path.join(output_dir, 'segments.csv')
+    cmd = build_segment_command('pipe:0', chunk_duration, output_dir, output_format, settings, stream_copy, segment_list)
+    
+    async with FFMPEG_SEM:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        # Drain stderr concurrently so a chatty ffmpeg can't block on a full pipe
+        stderr_task = asyncio.create_task(proc.stderr.read())
+        
+        try:
+            async for data in byte_chunks:
+                proc.stdin.write(data)
+                await proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            # ffmpeg exited early; its return code and stderr say why
+            pass
+        except BaseException:
+            proc.kill()
+            await proc.wait()
+            raise
+        finally:
+            if not proc.stdin.is_closing():
+                proc.stdin.close()
+        
+        stderr = await stderr_task
+        await proc.wait()
+    
+    if proc.returncode != 0:
+        raise RuntimeError(f"FFmpeg segment split failed: {stderr.decode(errors='replace')[-500:]}")
+    
+    chunks = read_segment_list(segment_list, output_dir)
+    logger.info(f"Created {len(chunks)} chunks from stream")
+    return chunks
+
 def setup_logging():
     """
     Set up logging configuration with both file and console handlers
@@ -473,8 +791,7 @@ def main():
             print(f"Analyzing {input_file}...", file=sys.stderr)
         
         # Calculate chunk duration based on output format - use same bitrates as encoding
-        base_bitrates = {'high': 128, 'medium': 96, 'low': 64}  # Match the quality_settings in split_audio()
-        output_bitrate = base_bitrates[args.quality]
+        output_bitrate = QUALITY_BITRATES_KBPS[args.quality]
         
         chunk_duration = calculate_chunk_duration(bitrate, max_size_mb, output_format, output_bitrate)
         num_chunks = math.ceil(duration / chunk_duration)